@@ -11,6 +11,7 @@
 import sys
 import numpy as np
 import random
+from secded import matrices
 
 np.set_printoptions(threshold=sys.maxsize)
 
@@ -70,25 +71,18 @@ def parity(v):
         n = n ^ (( v >> i) & 1)
     return int(n)
 
-om = np.zeros(shape=(r, k + r), dtype=np.uint32)
-
-# Nice mixture of list and numpy arrays, like always, ...
-# Juste add more [] when raising a syntax error :)
-
 # Parity check matrix (72, 64), Fig. 6 of Hsiao original '70 paper
-# Obtained by hand by Zook and Dobrzynski
-om[0] = [1,1,1,1,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,1,1,0,0, 0,1,1,0,1,0,0,0, 1,0,0,0,1,0,0,0, 1,0,0,0,1,0,0,0, 1,0,0,0,0,0,0,0, 1,0,0,0,0,0,0,0]
-om[1] = [1,1,1,1,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,0,0,0,0, 1,1,1,1,0,0,1,1, 0,1,1,0,0,1,0,0, 0,1,0,0,0,1,0,0, 0,1,0,0,0,1,0,0, 0,1,0,0,0,0,0,0, 0,1,0,0,0,0,0,0]
-om[2] = [0,0,1,1,0,0,0,0, 1,1,1,1,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,0,0,1,0, 0,0,1,0,0,0,1,0, 0,0,1,0,0,0,1,0, 0,0,1,0,0,1,1,0, 0,0,1,0,0,0,0,0]
-om[3] = [1,1,0,0,1,1,1,1, 0,0,0,0,0,0,0,0, 1,1,1,1,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,0,0,0,1, 0,0,0,1,0,0,0,1, 0,0,0,1,0,0,0,1, 0,0,0,1,0,1,1,0, 0,0,0,1,0,0,0,0]
-om[4] = [0,1,1,0,1,0,0,0, 1,0,0,0,1,0,0,0, 1,0,0,0,1,0,0,0, 1,0,0,0,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,0,0,0,0, 1,1,1,1,0,0,1,1, 0,0,0,0,1,0,0,0]
-om[5] = [0,1,1,0,0,1,0,0, 0,1,0,0,0,1,0,0, 0,1,0,0,0,1,0,0, 0,1,0,0,0,0,0,0, 1,1,1,1,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,1,1,0,0, 0,0,0,0,0,1,0,0]
-om[6] = [0,0,0,0,0,0,1,0, 0,0,1,0,0,0,1,0, 0,0,1,0,0,0,1,0, 0,0,1,0,0,1,1,0, 1,1,0,0,1,1,1,1, 0,0,0,0,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,1,1,1,1, 0,0,0,0,0,0,1,0]
-om[7] = [0,0,0,0,0,0,0,1, 0,0,0,1,0,0,0,1, 0,0,0,1,0,0,0,1, 0,0,0,1,0,1,1,0, 0,0,1,1,0,0,0,0, 1,1,1,1,0,0,0,0, 1,1,1,1,0,0,0,0, 1,1,1,1,1,1,1,1, 0,0,0,0,0,0,0,1]
+# Obtained by hand by Zook and Dobrzynski, see secded/matrices.py
+om = matrices.hsiao()
 
 # Easier to find which column matches in case of single error
 mo = np.transpose(om)
 
+# Even easier: column index for each of the 256 syndromes, -1 if none
+col = np.full(shape=1 << r, fill_value=-1, dtype=np.int16)
+for i in range(0, k + r):
+    col[l2i(mo[i])] = i
+
 def bitcount(pcm):
     for i in range(0, k + r):
         row = pcm[i,0:8]
@@ -97,68 +91,66 @@ def bitcount(pcm):
         print(rr.bit_count())
     sys.exit(1)
 
-# The nice thing is that the results do not depend on the value
-# being worked on, so a rough check will do for now.
-x = 0xdeadbeefcafebabe
-cb = compute_checkbits(om, x)
-checkbits = l2i(cb)
-bv = (x << r) | checkbits
-sy = compute_syndrome(om, bv)
-print("Checkbits ⇒ ", cb)
-print("Syndrome  ⇒ ", sy)
-print("Single bit error: syndrome contains erroneous bit column pattern")
-print("Double bit error: even parity indicates double error")
-
-for i in range(0, k):
-    y = x ^ (1 << i)
-    sdr = compute_syndrome(om, (y << r) | checkbits)
-    print(sdr, f"{parity(l2i(sdr))} ⇒ ", end='')
-    # Pattern matches erroneous bit
-    w = np.where(np.all(mo == sdr, axis = 1))
-    print(w[0][0])
-
-for i in range(0, k):
-    y = x ^ (3 << i)
-    sdr = compute_syndrome(om, (y << r) | checkbits)
-    print(sdr, parity(l2i(sdr)))
-
-print("Testing 10000 random numbers without errors")
-for _ in range(0, 1):
-    n = random.getrandbits(64)
-    cb = compute_checkbits(om, n)
-    c = l2i(cb)
-    nc = (n << r) | c
-    sy = compute_syndrome(om, nc)
-    s = l2i(sy)
-    assert s == 0, f"Error! Syndrome is not equal to 0"
-
-print("Testing 10000 random numbers with either simple or double errors")
-for _ in range(0, 10000):
-    n = random.getrandbits(64)
-    cb = compute_checkbits(om, n)
-    c = l2i(cb)
-    nc = (n << r) | c
-    bf = random.randint(0, 71)
-    # Bit 64 is in position 0 in the om array
-    nc = nc ^ (1 << (71 - bf))
-    fb = -1
-    if _ % 10 == 9:
-        fb = random.randint(0, 71)
-        nc = nc ^ (1 << (71 - fb))
-    sy = compute_syndrome(om, nc)
-    s = l2i(sy)
-
-    if fb == bf:
+if __name__ == "__main__":
+    # The nice thing is that the results do not depend on the value
+    # being worked on, so a rough check will do for now.
+    x = 0xdeadbeefcafebabe
+    cb = compute_checkbits(om, x)
+    checkbits = l2i(cb)
+    bv = (x << r) | checkbits
+    sy = compute_syndrome(om, bv)
+    print("Checkbits ⇒ ", cb)
+    print("Syndrome  ⇒ ", sy)
+    print("Single bit error: syndrome contains erroneous bit column pattern")
+    print("Double bit error: even parity indicates double error")
+
+    for i in range(0, k):
+        y = x ^ (1 << i)
+        sdr = compute_syndrome(om, (y << r) | checkbits)
+        print(sdr, f"{parity(l2i(sdr))} ⇒ ", end='')
+        # Pattern matches erroneous bit
+        print(col[l2i(sdr)])
+
+    for i in range(0, k):
+        y = x ^ (3 << i)
+        sdr = compute_syndrome(om, (y << r) | checkbits)
+        print(sdr, parity(l2i(sdr)))
+
+    print("Testing 10000 random numbers without errors")
+    for _ in range(0, 1):
+        n = random.getrandbits(64)
+        cb = compute_checkbits(om, n)
+        c = l2i(cb)
+        nc = (n << r) | c
+        sy = compute_syndrome(om, nc)
+        s = l2i(sy)
         assert s == 0, f"Error! Syndrome is not equal to 0"
-    else:
-        assert s != 0, f"Error! Syndrome is equal to 0"
-    if parity(s) == 1:
-        """Single error"""
-        w = np.where(np.all(mo == sy, axis = 1))
-        assert fb == -1 and bf == w[0][0], "Outch! Corrected the wrong bit"
-    else:
-        """Double error"""
-        assert fb != -1, "Arghl! WTF, Double error detected but not injected"
-
-dump_verilog(om)
-sys.exit(0)
+
+    print("Testing 10000 random numbers with either simple or double errors")
+    for _ in range(0, 10000):
+        n = random.getrandbits(64)
+        cb = compute_checkbits(om, n)
+        c = l2i(cb)
+        nc = (n << r) | c
+        bf = random.randint(0, 71)
+        # Bit 64 is in position 0 in the om array
+        nc = nc ^ (1 << (71 - bf))
+        fb = -1
+        if _ % 10 == 9:
+            fb = random.randint(0, 71)
+            nc = nc ^ (1 << (71 - fb))
+        sy = compute_syndrome(om, nc)
+        s = l2i(sy)
+
+        if fb == bf:
+            assert s == 0, f"Error! Syndrome is not equal to 0"
+        else:
+            assert s != 0, f"Error! Syndrome is equal to 0"
+        if parity(s) == 1:
+            """Single error"""
+            assert fb == -1 and bf == col[s], "Outch! Corrected the wrong bit"
+        else:
+            """Double error"""
+            assert fb != -1, "Arghl! WTF, Double error detected but not injected"
+
+    dump_verilog(om)
@@ -78,12 +78,9 @@ def check_error(syndrome):
     m10 = syndrome & 3
     m10p = s%3
 
-    sb = np.array(list(np.binary_repr(s).zfill(8))).astype(np.int8)
-    m10b = np.array(list(np.binary_repr(m10).zfill(2))).astype(np.int8)
-    m10pb = np.array(list(np.binary_repr(m10p).zfill(2))).astype(np.int8)
-
-    # print(f"Syndrome: ", sb, m10b, m10pb, f"({s.bit_count()})", f"{np.where(np.all(mo[:,0:8] == sb, axis = 1))[0][0]:2d} ⇒ ", end='')
-    print(f"Syndrome: ", sb, m10b, m10pb, f"({s.bit_count()})", end='')
+    # The exhaustive syndrome table of secded.decode.class_table replaces
+    # these rules in the package, and checks them
+    print(f"Syndrome: {s:08b} {m10:02b} {m10p:02b} ({s.bit_count()})", end='')
 
     if syndrome == 0:
         print("""No error""")
@@ -264,5 +261,3 @@ for i in range(0, k):
     sdr = compute_syndrome(om, (y << r + 2) | checkbits)
     print(sdr, parity(l2i(sdr)))
 """
-
-sys.exit(0)
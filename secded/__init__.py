@@ -0,0 +1,13 @@
+#
+# SEC-DED codes protecting 64-bit data, as an importable package
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from .codes import CODES, SecdedCode, get_code, register
+from .encode import ENGINES, checkbits, compute_checkbits, encode_batch
+from .decode import (NO_ERROR, RESIDUE_ERROR, CHECK_ERROR, SINGLE_ERROR,
+                     DOUBLE_ERROR, STATUS_NAMES, compute_syndrome,
+                     syndrome_batch, classify_batch, decode_batch,
+                     correct, correct_batch)
+from .verify import Violation, verify, verify_pcm
@@ -0,0 +1,7 @@
+#
+# python -m secded
+#
+
+from .cli import main
+
+main()
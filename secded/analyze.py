@@ -0,0 +1,90 @@
+#
+# Rough timing and area of the generated encoder and corrector, straight
+# from the matrix and the emitter options, to compare codes without
+# running synthesis. Everything is counted in 2-input gates and in levels
+# of such gates; inverters are left out, as they usually end up merged
+# in the gates by synthesis.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import json
+
+from .cse import fanouts, output_depths, tree_depth, xor_count
+from .verilog import xor_nets
+
+# Syndrome bits the correction of codeword bit b looks at: all of them for
+# a compare, only the ones set in its column for an and (check bits are
+# always compared, see dump_prim), or the literals of the minimized cubes
+def flip_inputs(code, b, cmp, cubes=None):
+    if cubes is not None:
+        care = 0
+        for c, _ in cubes[b]:
+            care = care | c
+        return [i for i in range(0, code.r) if (care >> (code.r - 1 - i)) & 1]
+    s = int(code.column_syndromes[b])
+    if cmp or b >= code.k:
+        return list(range(0, code.r))
+    return [i for i in range(0, code.r) if (s >> (code.r - 1 - i)) & 1]
+
+# Report on the encoder and the corrector (the _cor module) of a code,
+# as a dict ready for json. Syndrome lists are per row of the matrix,
+# fan-outs per data bit (encoder) or codeword bit (corrector).
+def analyze(code, cmp=True, cse=False, cubes=None):
+    nets = xor_nets(code, cse)
+    enc, syn = nets["enc"], nets["syndrome"]
+    r = code.r
+
+    enc_depth = output_depths(enc)
+    enc_fanout = fanouts(enc)
+
+    syn_depth = output_depths(syn)
+    flips = [flip_inputs(code, b, cmp, cubes) for b in range(0, code.n)]
+    if cubes is None:
+        and2 = sum(len(f) - 1 for f in flips)
+    else:
+        # One and per cube, or-ed together
+        and2 = sum(c[0].bit_count() - 1 for b in cubes for c in b) + sum(len(b) - 1 for b in cubes)
+    # The correction of each bit is an and of the syndrome bits (or of
+    # their inverse), then an xor with the bit itself
+    corrected = [tree_depth([syn_depth[i] for i in f]) + 1 for f in flips]
+    crit = max(range(0, code.n), key=lambda b: corrected[b])
+    # ne is a nor of the syndrome bits, se their xor, and the double error
+    # flag a nor of both
+    flags = 2 * (r - 1) + 1
+    err_depth = tree_depth(syn_depth) + 1
+    dec_fanout = [f + 1 for f in fanouts(syn)]
+
+    return {
+        "code": code.name, "n": code.n, "k": code.k, "r": r,
+        "cmp": cmp, "cse": cse, "minimized": cubes is not None,
+        "encoder": {
+            "xor2": xor_count(enc),
+            "depth": enc_depth,
+            "max_depth": max(enc_depth),
+            "fanout": enc_fanout,
+            "max_fanout": max(enc_fanout),
+        },
+        "decoder": {
+            "syndrome_xor2": xor_count(syn),
+            "syndrome_depth": syn_depth,
+            "flip_and2": and2,
+            "correct_xor2": code.n,
+            "flag_gates": flags,
+            "gates": xor_count(syn) + and2 + code.n + flags,
+            "fanout": dec_fanout,
+            "max_fanout": max(dec_fanout),
+            "critical_path": {
+                "bit": crit,
+                "syndrome": max(syn_depth[i] for i in flips[crit]),
+                "flip": corrected[crit] - 1 - max(syn_depth[i] for i in flips[crit]),
+                "correct": 1,
+                "depth": corrected[crit],
+            },
+            "err_depth": err_depth,
+        },
+    }
+
+def write_report(reports, f):
+    json.dump(reports, f, indent=2)
+    f.write("\n")
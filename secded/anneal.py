@@ -0,0 +1,219 @@
+#
+# Simulated annealing of the data columns of a parity check matrix, as an
+# alternative to the random draws of search.py: the check bit columns are
+# the identity, and each move swaps a data column for an unused column of
+# the pool, which holds all the syndromes the rules of the family take
+# for a single data error (weight 3 and 5 columns for hsiao, the weight 3
+# ones with or without residue bit for lala).
+# The cost is a weighted sum of the number of ones, the maximum row weight
+# (the xor depth), the squared distance of the row weights to their mean
+# and the literals of the flip conditions. All the columns, check bits
+# included, have an odd weight, so that any set of distinct ones is
+# SEC-DED (two of them xor to an even non zero syndrome, three to an odd
+# one) and the search never leaves the valid matrices.
+# All the terms are updated from the swapped columns only: row weights
+# through the counters of HammingScorer, literals through the number of
+# columns containing each column (a column contained in no other one is
+# flipped on an and of its ones, otherwise on a full compare). When no
+# pool column contains another, as the weight 3 ones of lala, literals
+# are the same for all the matrices and left out of the cost.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from math import exp, log
+
+import numpy as np
+
+from .decode import SINGLE_ERROR, classify_syndromes
+from .matrices import k
+from .score import HammingScorer
+from .verify import verify_pcm
+
+ROWS = {"hsiao": 8, "lala": 9}
+
+WEIGHTS = {"ones": 1.0, "max_row": 4.0, "balance": 0.5, "literals": 0.1}
+
+# Single data error syndromes of the family, up to max_weight ones
+def pool_columns(family, max_weight=5):
+    r = ROWS[family]
+    s = np.arange(1 << r)
+    single = (classify_syndromes(family, s) == SINGLE_ERROR) & (np.bitwise_count(s) <= max_weight)
+    return [int(c) for c in s[single]]
+
+def check_columns(family):
+    r = ROWS[family]
+    return [1 << (r - 1 - i) for i in range(0, r)]
+
+# Current selection of data columns, with the counters the cost depends
+# on, so that trying a move only looks at the two swapped columns and at
+# the pool columns they contain or are contained in
+class Annealer:
+    def __init__(self, family, data, weights=WEIGHTS, pool=None):
+        self.family = family
+        self.r = ROWS[family]
+        self.weights = weights
+        self.status = classify_syndromes(family, np.arange(1 << self.r))
+        self.checks = check_columns(family)
+        self.data = list(data)
+        self.present = set(self.checks) | set(self.data)
+        self.scorer = HammingScorer(self.checks + self.data, self.r)
+        cols = set(pool_columns(family) if pool is None else pool) | set(self.data)
+        if any(c.bit_count() % 2 == 0 for c in cols):
+            raise ValueError("even weight columns, the moves would need checking")
+        # Pool columns strictly contained in, and containing, each column
+        self.below = {c: [d for d in cols if d != c and d & c == d] for c in cols}
+        self.above = {c: [d for d in cols if d != c and d & c == c] for c in cols}
+        self.nested = any(self.below.values())
+        # Number of other data columns containing each data column
+        self.covered = {c: sum(1 for d in self.above[c] if d in self.present) for c in self.data}
+        self.lit = self.r * self.r + sum(self._literals(c, n) for c, n in self.covered.items())
+        self.current = self._terms(self.scorer.ones, self.lit)
+        self.current_cost = self._cost(self.current)
+
+    # Row weights, first row first, from the counters of the scorer
+    def rows(self, ones=None):
+        ones = self.scorer.ones if ones is None else ones
+        return [ones[self.r - 1 - i] for i in range(0, self.r)]
+
+    def _literals(self, c, covered):
+        return c.bit_count() if covered == 0 else self.r
+
+    def literals(self):
+        return self.lit
+
+    def _terms(self, ones, literals):
+        rows = self.rows(ones)
+        mean = sum(rows) / self.r
+        return {"ones": sum(rows), "max_row": max(rows),
+                "balance": sum((w - mean) ** 2 for w in rows),
+                "literals": literals}
+
+    def _cost(self, terms):
+        return sum(self.weights.get(t, 0) * v for t, v in terms.items()
+                   if t != "literals" or self.nested)
+
+    def terms(self):
+        return self.current
+
+    def cost(self):
+        return self.current_cost
+
+    # Whether the matrix stays SEC-DED with old replaced by new, which
+    # only needs new to be an unused single error, all columns being odd
+    def valid_swap(self, old, new):
+        return new not in self.present and self.status[new] == SINGLE_ERROR
+
+    # Literals after the swap, from the columns contained in old or new
+    # and the ones containing new
+    def _swap_literals(self, old, new):
+        if not self.nested:
+            return self.lit
+        lit = self.lit - self._literals(old, self.covered[old])
+        below_old, below_new = self.below[old], self.below[new]
+        for c in set(below_old) | set(below_new):
+            if c == old or c not in self.covered:
+                continue
+            cov = self.covered[c]
+            after = cov - (c in below_old) + (c in below_new)
+            lit += self._literals(c, after) - self._literals(c, cov)
+        n = sum(1 for d in self.above[new] if d in self.covered and d != old)
+        return lit + self._literals(new, n)
+
+    def delta(self, old, new):
+        ones = list(self.scorer.ones)
+        for b in range(0, self.r):
+            ones[b] += ((new >> b) & 1) - ((old >> b) & 1)
+        after = self._terms(ones, self._swap_literals(old, new))
+        return self._cost(after) - self.current_cost, after
+
+    def swap(self, old, new, after=None):
+        if after is None:
+            after = self.delta(old, new)[1]
+        self.data[self.data.index(old)] = new
+        self.present.discard(old)
+        self.present.add(new)
+        self.scorer.swap(old, new)
+        del self.covered[old]
+        for c in self.below[old]:
+            if c in self.covered:
+                self.covered[c] -= 1
+        for c in self.below[new]:
+            if c in self.covered:
+                self.covered[c] += 1
+        self.covered[new] = sum(1 for d in self.above[new] if d in self.covered)
+        self.lit = after["literals"]
+        self.current = after
+        self.current_cost = self._cost(after)
+
+def anneal(family, iterations=20000, seed=0, weights=WEIGHTS, start=None,
+           t_start=None, t_end=0.01):
+    rng = np.random.default_rng(seed)
+    pool = pool_columns(family)
+    if start is None:
+        start = [pool[i] for i in rng.choice(len(pool), size=k, replace=False)]
+    a = Annealer(family, start, weights, pool)
+    if t_start is None:
+        # About the cost of an average uphill move
+        unused = [c for c in pool if c not in a.present]
+        t_start = max(1.0, np.mean([abs(a.delta(a.data[rng.integers(k)], unused[i])[0])
+                                    for i in rng.integers(len(unused), size=50)]))
+    decay = exp(log(t_end / t_start) / max(1, iterations))
+    t = t_start
+    best, best_cost = list(a.data), a.cost()
+    for _ in range(0, iterations):
+        old = a.data[rng.integers(k)]
+        new = pool[rng.integers(len(pool))]
+        t = t * decay
+        if not a.valid_swap(old, new):
+            continue
+        d, after = a.delta(old, new)
+        if d <= 0 or rng.random() < exp(-d / t):
+            a.swap(old, new, after)
+            if a.cost() < best_cost - 1e-9:
+                best, best_cost = list(a.data), a.cost()
+    result = Annealer(family, best, weights, pool)
+    return result, build_pcm(family, best)
+
+# Matrix in the layout of the family: check bits 8 down to 0 then data
+# bits 63 down to 0 as lala, data bits then check bits as hsiao. Data
+# columns are sorted, residue ones first for lala.
+def build_pcm(family, data):
+    r = ROWS[family]
+    data = sorted(data, key=lambda c: (c & 1, c), reverse=True)
+    cols = check_columns(family) + data if family == "lala" else data + check_columns(family)
+    pcm = np.array([[(c >> (r - 1 - i)) & 1 for c in cols] for i in range(0, r)], dtype=np.uint32)
+    violations = verify_pcm(pcm, family)
+    if violations:
+        raise AssertionError(f"annealed matrix is not SEC-DED: {violations[0]}")
+    return pcm
+
+# Source of a function building the matrix, in the format of matrices.py
+def format_pcm(name, pcm, family):
+    r = pcm.shape[0]
+    checks = [r] if family == "lala" else []
+    groups = checks + [8, 8, 8, 4, 4, 8, 8, 8, 8] + ([8] if family == "hsiao" else [])
+    shape = "r + 1, k + r + 1" if r == 9 else "r, k + r"
+    def row(values):
+        out, j = [], 0
+        for g in groups:
+            out.append(",".join(str(v) for v in values[j:j + g]))
+            j = j + g
+        return ", ".join(out)
+    # Headers, one character per column as in the rows
+    kinds, tens, units = [], [], []
+    for b in range(0, pcm.shape[1]):
+        if (family == "lala" and b < r) or (family == "hsiao" and b >= k):
+            kinds.append("c"), tens.append(" "), units.append(str(r - 1 - b % k if family == "hsiao" else r - 1 - b))
+        else:
+            d = k - 1 - (b - r if family == "lala" else b)
+            kinds.append("d"), tens.append(str(d // 10)), units.append(str(d % 10))
+    lead = f"    {name}[0] = ["
+    lines = ["@cache", f"def {name}():",
+             f"    {name} = np.zeros(shape=({shape}), dtype=np.uint32)"]
+    for h in (kinds, tens, units):
+        lines.append(("    #" + " " * (len(lead) - 5) + row(h).replace(",", " ")).rstrip())
+    for i in range(0, r):
+        lines.append(f"    {name}[{i}] = [{row(pcm[i].tolist())}] #{int(pcm[i].sum())}")
+    lines.append(f"    return _frozen({name})")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,147 @@
+#
+# Throughput of the encoders, decoders and Verilog emitters of all the
+# codes, saved as json so that two commits can be compared.
+# Each measure is the best of a few repetitions, each repetition being
+# long enough (MIN_TIME) for the timer not to matter.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from .codes import CODES, get_code
+from .decode import (classify_batch, compute_syndrome, correct, correct_batch,
+                     decode_batch)
+from .encode import ENGINES, checkbits, compute_checkbits, encode_batch
+
+SIZES = (1 << 10, 1 << 16, 1 << 20)
+REPEAT = 3
+MIN_TIME = 0.1
+
+# Words processed by the slow, straight from the matrix, functions
+SCALAR = 200
+
+# Best time of one call of fn, in seconds
+def best_time(fn, repeat=REPEAT, min_time=MIN_TIME):
+    best = None
+    for _ in range(0, repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls = calls + 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = elapsed / calls if best is None else min(best, elapsed / calls)
+    return best
+
+def _result(code, bench, engine, batch, seconds):
+    return {"code": code.name, "bench": bench, "engine": engine, "batch": batch,
+            "seconds": seconds, "rate": batch / seconds}
+
+# Scalar functions, one word at a time, rates in words per second
+def bench_scalar(code, words):
+    words = words[0:SCALAR].tolist()
+    check = [checkbits(code, w) for w in words]
+    results = [
+        _result(code, "compute_checkbits", "reference", len(words),
+                best_time(lambda: [compute_checkbits(code, w) for w in words])),
+        _result(code, "compute_syndrome", "reference", len(words),
+                best_time(lambda: [compute_syndrome(code, w, c) for w, c in zip(words, check)])),
+        _result(code, "correct", code.engine, len(words),
+                best_time(lambda: [correct(code, w, c) for w, c in zip(words, check)])),
+    ]
+    for engine in ENGINES:
+        results.append(_result(code, "checkbits", engine, len(words),
+                               best_time(lambda: [checkbits(code, w, engine) for w in words])))
+    return results
+
+# Batch functions, rates in words per second
+def bench_batch(code, words, sizes=SIZES):
+    results = []
+    for size in sizes:
+        w = words[0:size]
+        c = encode_batch(code, w)
+        # Syndromes of all kinds, taken from the random words
+        s = (w >> np.uint64(48)).astype(np.uint16) & ((1 << code.r) - 1)
+        for engine in ENGINES:
+            results.append(_result(code, "encode_batch", engine, size,
+                                   best_time(lambda: encode_batch(code, w, engine))))
+        results.append(_result(code, "decode_batch", code.engine, size,
+                               best_time(lambda: decode_batch(code, w, c))))
+        results.append(_result(code, "correct_batch", code.engine, size,
+                               best_time(lambda: correct_batch(code, w, c))))
+        results.append(_result(code, "classify_batch", "rules", size,
+                               best_time(lambda: classify_batch(code, s))))
+    return results
+
+# Time to write the Verilog of the code, rate in files per second
+def bench_verilog(code):
+    from .verilog import dump_verilog
+    with tempfile.TemporaryDirectory() as d:
+        return [_result(code, "dump_verilog", "cmp", 1,
+                        best_time(lambda: dump_verilog(code, outdir=d), repeat=1))]
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(codes=None, sizes=SIZES, seed=0):
+    rng = np.random.default_rng(seed)
+    words = rng.integers(0, 1 << 64, size=max(max(sizes), SCALAR), dtype=np.uint64)
+    results = []
+    for name in codes or CODES:
+        code = get_code(name)
+        results += bench_scalar(code, words)
+        results += bench_batch(code, words, sizes)
+        results += bench_verilog(code)
+    return {"commit": _commit(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results}
+
+def _key(r):
+    return (r["code"], r["bench"], r["engine"], r["batch"])
+
+def print_results(report):
+    print(f"commit {report['commit']}, python {report['python']}, numpy {report['numpy']}")
+    print(f"{'code':<16} {'bench':<18} {'engine':<10} {'batch':>8} {'rate':>14}")
+    for r in report["results"]:
+        print(f"{r['code']:<16} {r['bench']:<18} {r['engine']:<10} {r['batch']:>8} {r['rate']:>14.4g}")
+
+# Rate of the new report over the old one for each common measure, the
+# ones slower by more than the threshold being flagged
+def compare(old, new, threshold=0.1):
+    before = {_key(r): r for r in old["results"]}
+    print(f"commit {old['commit']} -> {new['commit']}")
+    slower = 0
+    for r in new["results"]:
+        if _key(r) not in before:
+            continue
+        ratio = r["rate"] / before[_key(r)]["rate"]
+        flag = " slower" if ratio < 1 - threshold else ""
+        slower = slower + (flag != "")
+        print(f"{r['code']:<16} {r['bench']:<18} {r['engine']:<10} {r['batch']:>8} {ratio:>8.2f}x{flag}")
+    return slower
+
+def save(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
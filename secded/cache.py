@@ -0,0 +1,83 @@
+#
+# On-disk cache of the tables derived from the matrices, so that each
+# process (pool workers included) maps them instead of rebuilding them.
+# Files are named after a hash of the matrix and of the layout of the
+# code, so that changing a matrix, here or in the scripts, just makes a
+# new entry: there is nothing to invalidate.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import hashlib
+import os
+import tempfile
+from functools import cached_property
+
+import numpy as np
+
+# Bumped whenever the contents of a table change for a given matrix
+FORMAT = 2
+
+# $SECDED_CACHE, set to an empty string to disable the cache
+def cache_dir():
+    d = os.environ.get("SECDED_CACHE")
+    if d is None:
+        d = os.path.join(os.path.expanduser("~"), ".cache", "secded")
+    return d
+
+# Hash of everything a table depends on
+def code_key(code):
+    h = hashlib.sha256()
+    h.update(f"{FORMAT} {code.family} {code.data_col} {code.check_col} {code.pcm.shape}".encode())
+    h.update(np.ascontiguousarray(code.pcm, dtype=np.uint8).tobytes())
+    return h.hexdigest()[:20]
+
+def table_path(code, name):
+    return os.path.join(cache_dir(), f"{code_key(code)}-{name}.npy")
+
+# Memory-map the table if it is there, otherwise build it and store it.
+# Failing to write is not an error, the table is just not cached.
+def load_or_build(code, name, build):
+    if not cache_dir():
+        return build()
+    path = table_path(code, name)
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    table = build()
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        # Written aside then renamed, so that concurrent processes never
+        # see a partial file
+        fd, tmp = tempfile.mkstemp(dir=cache_dir(), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+    return table
+
+# Same as cached_property, going through the disk cache the first time
+def cached_table(build):
+    def get(code):
+        return load_or_build(code, build.__name__, lambda: build(code))
+    get.__name__ = build.__name__
+    get.__doc__ = build.__doc__
+    return cached_property(get)
+
+# Remove the cached tables, returns how many files were removed
+def clear():
+    d = cache_dir()
+    if not d or not os.path.isdir(d):
+        return 0
+    n = 0
+    for f in os.listdir(d):
+        if f.endswith(".npy") or f.endswith(".tmp"):
+            os.remove(os.path.join(d, f))
+            n = n + 1
+    return n
@@ -0,0 +1,116 @@
+#
+# Sanity checks of the package, in the spirit of the check_* functions
+# of the scripts: they assert and die on the first discrepancy.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+import numpy as np
+
+from .decode import (NO_ERROR, RESIDUE_ERROR, CHECK_ERROR, SINGLE_ERROR,
+                     DOUBLE_ERROR, STATUS_NAMES, correct_batch, rule_mismatches)
+from .encode import ENGINES, checkbits, compute_checkbits, encode_batch
+from .inject import ber_model
+
+VALUES = [0x0000000000000000, 0xffffffffffffffff, 0xdeadbeefdeadbeef,
+          0x5555555555555555, 0xaaaaaaaaaaaaaaaa, 0x8badf00dcafebabe]
+
+# All engines, scalar and batched, must give the same check bits as the
+# straight from the matrix compute_checkbits
+def check_engines(code, n=1000, seed=0):
+    print(f"Testing {n} random numbers through the {', '.join(ENGINES)} engines of {code.name}")
+    rng = np.random.default_rng(seed)
+    words = np.concatenate((np.array(VALUES, dtype=np.uint64),
+                            rng.integers(0, 1 << 64, size=n, dtype=np.uint64)))
+    ref = [compute_checkbits(code, w) for w in words.tolist()]
+    for engine in ENGINES:
+        batch = encode_batch(code, words, engine).tolist()
+        assert batch == ref, f"Batched {engine} engine disagrees with compute_checkbits on {code.name}!"
+        for w, c in zip(words.tolist(), ref):
+            assert checkbits(code, w, engine) == c, f"Scalar {engine} engine disagrees with compute_checkbits on {code.name} for {w:016x}!"
+
+# Encode, inject no error, one data error, one check bit error or two
+# errors anywhere in the codeword, and decode, over n random words each
+def check_round_trip(code, n=1000, seed=0):
+    print(f"Testing {n} random numbers through encoding and correction with {code.name}")
+    rng = np.random.default_rng(seed)
+    words = rng.integers(0, 1 << 64, size=n, dtype=np.uint64)
+    check = encode_batch(code, words)
+    one = np.uint64(1)
+
+    d, c, status = correct_batch(code, words, check)
+    assert (status == NO_ERROR).all(), f"Error reported while injecting no error with {code.name}!"
+
+    b = rng.integers(0, code.k, size=n).astype(np.uint64)
+    d, c, status = correct_batch(code, words ^ (one << b), check)
+    assert (status == SINGLE_ERROR).all(), f"Single bit data error classified as something else with {code.name}!"
+    assert (d == words).all() and (c == check).all(), f"Single bit data error not corrected with {code.name}!"
+
+    b = rng.integers(0, code.r, size=n).astype(np.uint16)
+    d, c, status = correct_batch(code, words, check ^ (np.uint16(1) << b))
+    assert np.isin(status, (CHECK_ERROR, RESIDUE_ERROR)).all(), f"Single bit check error classified as something else with {code.name}!"
+    assert (d == words).all() and (c == check).all(), f"Single bit check error not corrected with {code.name}!"
+
+    # Two distinct bits of the codeword, data bits first then check bits
+    i = rng.integers(0, code.n, size=n)
+    j = (i + rng.integers(1, code.n, size=n)) % code.n
+    data, chk = words.copy(), check.copy()
+    for b in (i, j):
+        data ^= np.where(b < code.k, one << np.minimum(b, code.k - 1).astype(np.uint64), np.uint64(0))
+        chk ^= np.where(b >= code.k, np.uint16(1) << np.maximum(b - code.k, 0).astype(np.uint16), np.uint16(0)).astype(chk.dtype)
+    status = correct_batch(code, data, chk)[2]
+    assert (status == DOUBLE_ERROR).all(), f"Double bit error classified as something else with {code.name}!"
+
+# The hand written rules of check_error must agree with the enumeration of
+# all single and double errors on every syndrome these errors give. On the
+# other ones the rules may see a single error where there is none.
+def check_rules(code):
+    print(f"Testing the classification rules of {code.name} against all single and double errors")
+    reached, other = rule_mismatches(code)
+    for s, rule, table in reached:
+        print(f"    syndrome {s:03x}: rules say {STATUS_NAMES[rule]}, enumeration {STATUS_NAMES[table]}")
+    assert not reached, f"Classification rules disagree with the enumeration on {code.name}!"
+    if other:
+        seen = sorted({STATUS_NAMES[rule] for _, rule, _ in other})
+        print(f"    {len(other)} syndromes of no single or double error taken for {', '.join(seen)} errors by the rules")
+
+# The ber model of inject must flip n * ber bits per word on average,
+# down to the rates of real memories: within 5 standard deviations
+def check_ber(code, ber=(1e-9, 1e-6, 1e-3), words=1 << 22, seed=0):
+    print(f"Testing the flip rate of the ber model on {words} words of {code.name}")
+    rng = np.random.default_rng(seed)
+    data = np.zeros(1 << 16, dtype=np.uint64)
+    check = encode_batch(code, data)
+    for p in ber:
+        flips = 0
+        for _ in range(0, words // len(data)):
+            dm, cm = ber_model(rng, code, data, check, p)
+            flips += int(np.bitwise_count(dm).sum()) + int(np.bitwise_count(cm).sum())
+        mean = code.n * p * (words // len(data) * len(data))
+        assert abs(flips - mean) <= 5 * np.sqrt(mean) + 1, f"ber model flips {flips} bits instead of {mean:.1f} at {p:g} with {code.name}!"
+
+# verilog --stages either writes the pipelined modules, or refuses the
+# options they do not implement rather than leaving them out
+def check_stages(stages=2):
+    from .cli import UNPIPELINED, main
+    print(f"Testing verilog --stages {stages} alone and along with {', '.join(UNPIPELINED)}")
+    values = {"--fanin": ["2"], "--arrivals": [os.devnull]}
+    with tempfile.TemporaryDirectory() as d:
+        base = ["verilog", "--code", "lala", "--outdir", d, "--stages", str(stages)]
+        with redirect_stdout(StringIO()):
+            main(base)
+        for kind in ("dec", "cor"):
+            assert os.path.exists(os.path.join(d, f"prim_secded_lala_cmp_73_64_{kind}_p{stages}.sv")), f"verilog --stages {stages} did not write the pipelined {kind} module!"
+        for option in UNPIPELINED:
+            try:
+                with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                    main(base + [option] + values.get(option, []))
+            except SystemExit as e:
+                assert e.code == 2, f"verilog --stages {stages} {option} failed with status {e.code}!"
+            else:
+                raise AssertionError(f"verilog --stages {stages} {option} left {option} out of the pipelined modules!")
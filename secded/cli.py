@@ -0,0 +1,299 @@
+#
+# Command line entry point, python -m secded <command> ...
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import argparse
+
+from .codes import CODES, get_code
+from .decode import DECODERS
+from .encode import ENGINES
+
+def cmd_stats(args):
+    from .stats import error_stats, print_stats
+    for name in args.code or CODES:
+        code = get_code(name)
+        print_stats(code.name, error_stats(code, args.weights, args.workers, args.decoder),
+                    args.decoder)
+
+def cmd_weights(args):
+    from .weights import print_weights
+    for name in args.code or CODES:
+        print_weights(get_code(name), args.ber)
+
+def cmd_search(args):
+    from .search import search
+    best = search(args.count, args.top, args.seed, args.workers)
+    print(f"{'ones':>5} {'max_row':>7} {'thd':>6} {'valid':>5}  picked")
+    for c in best:
+        print(f"{c['ones']:>5} {c['max_row']:>7} {c['thd']:>6} {c['valid']!s:>5}  {c['picked']}")
+
+def cmd_anneal(args):
+    from .anneal import WEIGHTS, anneal, format_pcm
+    weights = dict(WEIGHTS)
+    for w in args.weight or []:
+        term, value = w.split("=")
+        weights[term] = float(value)
+    a, pcm = anneal(args.family, args.iterations, args.seed, weights)
+    terms = a.terms()
+    print(f"# ones {terms['ones']}, max row {terms['max_row']}, balance {terms['balance']:.2f}, "
+          f"literals {terms['literals']}, rows {a.rows()}")
+    src = format_pcm(args.name, pcm, args.family)
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write("\n" + src)
+    else:
+        print(src, end="")
+
+def cmd_encode(args):
+    from .stream import encode_file
+    code = get_code(args.code)
+    n = encode_file(code, args.input, args.output, args.interleave, args.chunk, args.engine)
+    print(f"{args.input}: {n} words encoded with {code.name} into {args.output}")
+
+def cmd_scrub(args):
+    from .stream import EVENTS, scrub_file
+    code = get_code(args.code)
+    report = open(args.report, "w") if args.report else None
+    try:
+        n, counts = scrub_file(code, args.input, args.check, report, args.chunk, args.engine)
+    finally:
+        if report is not None:
+            report.close()
+    print(f"{args.input}: {n} words scrubbed with {code.name}, " +
+          ", ".join(f"{counts[e]} {e}" for e in EVENTS))
+
+# Arrival times of the codeword bits, in gate levels, data bits from bit 0
+# then check bits, separated by blanks
+def read_arrivals(path):
+    with open(path) as f:
+        return [int(float(t)) if float(t).is_integer() else float(t) for t in f.read().split()]
+
+# Options of verilog that the pipelined modules of --stages do not
+# implement, as flags
+UNPIPELINED = ("--minimize", "--keep-double", "--rom", "--cse", "--fanin", "--arrivals")
+
+def cmd_verilog(args):
+    from .minimize import flip_cubes, literal_count
+    from .pipeline import dump_pipelined
+    from .verilog import dump_verilog, xor_gates
+    arrivals = read_arrivals(args.arrivals) if args.arrivals else None
+    for name in args.code or CODES:
+        code = get_code(name)
+        cubes = None
+        if args.minimize:
+            cubes = flip_cubes(code, args.keep_double)
+            print(f"{code.name}: flip conditions with {code.n * code.r} literals as compares, "
+                  f"{literal_count(cubes)} minimized")
+        depths = dump_verilog(code, not args.use_and, args.outdir, args.cse, args.fanin, arrivals,
+                              cubes, args.rom)
+        if args.cse:
+            print(f"{code.name}: " + ", ".join(f"{key} {flat} -> {shared} xors"
+                                               for key, (flat, shared) in xor_gates(code).items()))
+        if args.fanin:
+            print(f"{code.name}: " + ", ".join(f"{key} depth {max(d)}" for key, d in depths.items()) +
+                  f" with {args.fanin}-input xors")
+        if args.stages:
+            meta = dump_pipelined(code, args.stages, cmp=not args.use_and, outdir=args.outdir)
+            print(f"{code.name}: {meta['latency']} cycles, registers after " +
+                  ", ".join(meta["cuts"]) + f", stage depths {meta['stage_depths']}")
+
+def cmd_check(args):
+    from .check import check_ber, check_engines, check_round_trip, check_rules, check_stages
+    from .verify import report, verify
+    check_stages()
+    for name in args.code or CODES:
+        code = get_code(name)
+        check_engines(code, args.count)
+        check_round_trip(code, args.count)
+        check_rules(code)
+        check_ber(code)
+        report(code.name, verify(code))
+
+def cmd_cache(args):
+    from . import cache
+    if args.clear:
+        print(f"{cache.cache_dir()}: {cache.clear()} tables removed")
+        return
+    names = ("row_masks", "byte_tables", "column_syndromes", "syndrome_to_bit",
+             "flip_data", "flip_check", "status_table", "rule_table")
+    for name in args.code or CODES:
+        code = get_code(name)
+        for t in names:
+            getattr(code, t)
+        print(f"{code.name}: {cache.code_key(code)}")
+    print(f"tables cached in {cache.cache_dir() or '(disabled)'}")
+
+def cmd_analyze(args):
+    import sys
+    from .analyze import analyze, write_report
+    from .minimize import flip_cubes
+    reports = []
+    for name in args.code or CODES:
+        code = get_code(name)
+        cubes = flip_cubes(code) if args.minimize else None
+        reports.append(analyze(code, not args.use_and, args.cse, cubes))
+    if args.output:
+        with open(args.output, "w") as f:
+            write_report(reports, f)
+    else:
+        write_report(reports, sys.stdout)
+
+def cmd_bench(args):
+    from . import bench
+    report = bench.run(args.code, args.sizes)
+    bench.print_results(report)
+    if args.output:
+        bench.save(report, args.output)
+    if args.compare:
+        bench.compare(bench.load(args.compare), report)
+
+def cmd_inject(args):
+    import time
+    from .inject import campaign, print_campaign
+    params = {"ber": args.ber} if args.model == "ber" else {}
+    for name in args.code or CODES:
+        code = get_code(name)
+        start = time.perf_counter()
+        counts = campaign(code, args.model, args.trials, args.seed, args.decoder, **params)
+        print_campaign(code.name, args.model, counts, time.perf_counter() - start, args.decoder)
+
+def cmd_scrubsim(args):
+    from .scrubsim import print_sweep, sweep
+    for name in args.code or CODES:
+        code = get_code(name)
+        results = sweep(code, args.words, args.fit, args.interval, args.duration, args.seed,
+                        args.decoder)
+        print_sweep(code, args.words, args.fit, args.duration, results, args.decoder)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="secded")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stats", help="outcome of all multiple bit error patterns")
+    p.add_argument("--code", action="append", help="code to study (default: all)")
+    p.add_argument("--weights", type=int, nargs="+", default=[3, 4])
+    p.add_argument("--workers", type=int, help="size of the process pool")
+    p.add_argument("--decoder", choices=DECODERS, default="rules",
+                   help="classification of the default modules (rules) or of the --rom ones (table)")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("weights", help="exact weight distribution and error probabilities")
+    p.add_argument("--code", action="append", help="code to study (default: all)")
+    p.add_argument("--ber", type=float, nargs="+", default=[1e-9, 1e-6, 1e-4, 1e-2],
+                   help="bit error rates")
+    p.set_defaults(func=cmd_weights)
+
+    p = sub.add_parser("search", help="random search of Lala-like matrices")
+    p.add_argument("--count", type=int, default=100000, help="candidates to draw")
+    p.add_argument("--top", type=int, default=10, help="candidates to keep")
+    p.add_argument("--seed", type=lambda s: int(s, 0), default=0xdeadbeef)
+    p.add_argument("--workers", type=int, help="size of the process pool")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("anneal", help="simulated annealing of balanced low-weight matrices")
+    p.add_argument("--family", choices=["lala", "hsiao"], default="lala")
+    p.add_argument("--iterations", type=int, default=20000, help="moves to try")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--weight", action="append",
+                   help="weight of a cost term, e.g. max_row=4 (ones, max_row, balance, literals)")
+    p.add_argument("--name", default="annealed", help="name of the matrix function")
+    p.add_argument("--output", help="file to append the matrix function to (default: standard output)")
+    p.set_defaults(func=cmd_anneal)
+
+    p = sub.add_parser("encode", help="encode a file of little-endian 64-bit words")
+    p.add_argument("--code", default="hsiao", help="code to use (default: hsiao)")
+    p.add_argument("--interleave", action="store_true",
+                   help="write packed (data, check bits) records instead of check bits only")
+    p.add_argument("--engine", choices=ENGINES, help="check bit computation engine")
+    p.add_argument("--chunk", type=int, default=1 << 20, help="words per chunk")
+    p.add_argument("input")
+    p.add_argument("output")
+    p.set_defaults(func=cmd_encode)
+
+    p = sub.add_parser("scrub", help="correct an encoded file in place")
+    p.add_argument("--code", default="hsiao", help="code to use (default: hsiao)")
+    p.add_argument("--engine", choices=ENGINES, help="check bit computation engine")
+    p.add_argument("--chunk", type=int, default=1 << 20, help="words per chunk")
+    p.add_argument("--report", help="file listing each event (word offset, event, bit)")
+    p.add_argument("input", help="data words, or interleaved records without check")
+    p.add_argument("check", nargs="?", help="check bits sidecar file")
+    p.set_defaults(func=cmd_scrub)
+
+    p = sub.add_parser("verilog", help="dump the encoder and decoder of the codes")
+    p.add_argument("--code", action="append", help="code to dump (default: all)")
+    p.add_argument("--and", dest="use_and", action="store_true",
+                   help="flip data bits on an and of the syndrome bits instead of a compare")
+    p.add_argument("--outdir", default=".", help="where to write the files")
+    p.add_argument("--cse", action="store_true",
+                   help="compute the xors shared by the check bits once (Paar's greedy factoring)")
+    p.add_argument("--fanin", type=int, choices=(2, 3, 4),
+                   help="write balanced trees of xors of this fan-in")
+    p.add_argument("--arrivals", help="file giving the arrival time of each codeword bit")
+    p.add_argument("--minimize", action="store_true",
+                   help="minimize the flip conditions, with the syndromes of no single error as don't cares")
+    p.add_argument("--keep-double", action="store_true",
+                   help="with --minimize, never flip a bit on a double error")
+    p.add_argument("--rom", action="store_true",
+                   help="decoder looking the syndrome up in a case statement giving its class")
+    p.add_argument("--stages", type=int, choices=(1, 2, 3),
+                   help="also write decoder and corrector with this many register stages")
+    p.set_defaults(func=cmd_verilog)
+
+    p = sub.add_parser("analyze", help="gate count, depth and fan-out of the generated Verilog, as json")
+    p.add_argument("--code", action="append", help="code to analyze (default: all)")
+    p.add_argument("--and", dest="use_and", action="store_true",
+                   help="flip data bits on an and of the syndrome bits instead of a compare")
+    p.add_argument("--cse", action="store_true", help="with the shared xors of verilog --cse")
+    p.add_argument("--minimize", action="store_true", help="with the flip conditions of verilog --minimize")
+    p.add_argument("--output", help="json file to write (default: standard output)")
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("bench", help="throughput of the encoders, decoders and emitters")
+    p.add_argument("--code", action="append", help="code to measure (default: all)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1 << 10, 1 << 16, 1 << 20],
+                   help="batch sizes")
+    p.add_argument("--output", help="json file to write the results to")
+    p.add_argument("--compare", help="json file of a previous run to compare with")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("inject", help="Monte Carlo fault injection campaign")
+    p.add_argument("--code", action="append", help="code to test (default: all)")
+    p.add_argument("--model", choices=["ber", "adjacent", "burst", "stuck"], default="ber",
+                   help="error model")
+    p.add_argument("--trials", type=int, default=1 << 20, help="number of words")
+    p.add_argument("--ber", type=float, default=1e-3, help="bit error rate of the ber model")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--decoder", choices=DECODERS, default="rules",
+                   help="classification of the default modules (rules) or of the --rom ones (table)")
+    p.set_defaults(func=cmd_inject)
+
+    p = sub.add_parser("scrubsim", help="uncorrectable errors of a whole memory versus scrub interval")
+    p.add_argument("--code", action="append", help="code to simulate (default: all)")
+    p.add_argument("--words", type=int, default=1 << 27, help="words of memory")
+    p.add_argument("--fit", type=float, default=1e6, help="soft error rate in FIT per Mbit")
+    p.add_argument("--interval", type=float, nargs="+", default=[1, 6, 24, 168],
+                   help="scrub intervals in hours")
+    p.add_argument("--duration", type=float, default=1e5, help="simulated hours")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--decoder", choices=DECODERS, default="rules",
+                   help="classification of the default modules (rules) or of the --rom ones (table)")
+    p.set_defaults(func=cmd_scrubsim)
+
+    p = sub.add_parser("check", help="self checks of the engines, correction and matrices")
+    p.add_argument("--code", action="append", help="code to check (default: all)")
+    p.add_argument("--count", type=int, default=1000, help="random words per check")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("cache", help="fill or clear the on-disk cache of derived tables")
+    p.add_argument("--code", action="append", help="code to cache (default: all)")
+    p.add_argument("--clear", action="store_true", help="remove all the cached tables")
+    p.set_defaults(func=cmd_cache)
+
+    args = parser.parse_args(argv)
+    if args.command == "verilog" and args.stages:
+        given = [o for o in UNPIPELINED if getattr(args, o[2:].replace("-", "_"))]
+        if given:
+            sub.choices["verilog"].error(f"--stages cannot be combined with {', '.join(given)}")
+    args.func(args)
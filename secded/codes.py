@@ -0,0 +1,184 @@
+#
+# SEC-DED codes as objects, so that the encoders and decoders do not
+# have to know where each paper decided to put the check bits.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import re
+from functools import cached_property
+
+import numpy as np
+
+from . import matrices
+from .cache import cached_table
+from .packed import PackedPCM
+
+# Throughout the package, data words are 64-bit integers with bit 0 as lsb,
+# and check bits (as well as syndromes) are integers in which the first
+# row of the parity check matrix is the msb, as l2i does in the scripts.
+# The tables derived from the matrix are built on first use, and kept in
+# the on-disk cache of cache.py for the next processes.
+class SecdedCode:
+    # pcm is the matrix, or a function building it on first use.
+    # data_col is the column of data bit k - 1 (data bits then follow
+    # msb first), check_col the column of the check bit of row 0.
+    # family selects the error classification rules (hsiao or lala),
+    # engine the default way of computing check bits (mask or table).
+    def __init__(self, name, pcm, data_col, check_col, family, engine="mask"):
+        self.name = name
+        self._pcm = pcm
+        self.data_col = data_col
+        self.check_col = check_col
+        self.family = family
+        self.engine = engine
+
+    def __repr__(self):
+        return f"SecdedCode({self.name!r})"
+
+    @cached_property
+    def pcm(self):
+        return self._pcm() if callable(self._pcm) else self._pcm
+
+    @property
+    def r(self):
+        return self.pcm.shape[0]
+
+    @property
+    def n(self):
+        return self.pcm.shape[1]
+
+    @property
+    def k(self):
+        return self.n - self.r
+
+    # Name without the (n, k) suffix, as used by the Verilog modules
+    @property
+    def short_name(self):
+        return re.sub(r"_\d+_\d+$", "", self.name)
+
+    # Column of the parity check matrix holding data bit b
+    def data_column(self, b):
+        return self.data_col + self.k - 1 - b
+
+    # Column holding check bit j, check bit 0 being the lsb, i.e. the last row
+    def check_column(self, j):
+        return self.check_col + self.r - 1 - j
+
+    # Column of bit b of the codeword, data bits first then check bits
+    def column(self, b):
+        if b < self.k:
+            return self.data_column(b)
+        return self.check_column(b - self.k)
+
+    # Rows and columns of the matrix as integers, see packed.py
+    @cached_property
+    def packed(self):
+        return PackedPCM(self.pcm)
+
+    # One mask per check bit row, with the data bits it covers: the data
+    # columns of the row, read with data bit k - 1 as msb
+    @cached_table
+    def row_masks(self):
+        p = self.packed
+        return np.array([p.field(i, self.data_col, self.data_col + self.k)
+                         for i in range(0, self.r)], dtype=np.uint64)
+
+    # Smallest little-endian unsigned type able to hold the check bits,
+    # used to store them in files
+    @cached_property
+    def check_dtype(self):
+        return np.dtype(np.uint8) if self.r <= 8 else np.dtype('<u2')
+
+    # Check bits contributed by each of the 256 values of each data byte,
+    # byte 0 being the least significant one
+    @cached_table
+    def byte_tables(self):
+        from .encode import encode_batch
+        v = np.arange(256, dtype=np.uint64)
+        return np.stack([encode_batch(self, v << np.uint64(8 * b), "mask")
+                         for b in range(0, self.k // 8)])
+
+    # Same as lists, indexing numpy arrays one word at a time is slow
+    @cached_property
+    def byte_lists(self):
+        return self.byte_tables.tolist()
+
+    # Syndrome produced by a single error on each bit of the codeword,
+    # data bits 0 to k - 1 followed by check bits 0 to r - 1
+    @cached_table
+    def column_syndromes(self):
+        cols = self.packed.cols
+        return np.array([cols[self.column(b)] for b in range(0, self.n)], dtype=np.uint16)
+
+    # Bit to flip for each syndrome, -1 when no single error produces it
+    # (no error at all, or uncorrectable error)
+    @cached_table
+    def syndrome_to_bit(self):
+        table = np.full(shape=1 << self.r, fill_value=-1, dtype=np.int16)
+        table[self.column_syndromes] = np.arange(self.n, dtype=np.int16)
+        return table
+
+    # Same information as masks to xor onto the data and check bits
+    @cached_table
+    def flip_data(self):
+        b = self.syndrome_to_bit
+        flip = np.zeros(shape=b.shape, dtype=np.uint64)
+        d = (b >= 0) & (b < self.k)
+        flip[d] = np.left_shift(np.uint64(1), b[d].astype(np.uint64))
+        return flip
+
+    @cached_table
+    def flip_check(self):
+        b = self.syndrome_to_bit
+        flip = np.zeros(shape=b.shape, dtype=np.uint16)
+        c = b >= self.k
+        flip[c] = np.left_shift(1, b[c] - self.k).astype(np.uint16)
+        return flip
+
+    # Error class of each syndrome, from the enumeration of all single and
+    # double errors, see class_table
+    @cached_table
+    def status_table(self):
+        from .decode import class_table
+        return class_table(self)[0]
+
+    # Error class of each syndrome by the rules of the family, as
+    # check_error in the scripts and the default Hsiao modules; the
+    # default _dec and _cor modules of the other codes flag errors on the
+    # parity of the syndrome, which only differs on syndromes of weight 5
+    # or more (and on weight 3 ones for paperlala's two residue bits)
+    @cached_table
+    def rule_table(self):
+        from .decode import classify_syndromes
+        return classify_syndromes(self.family, np.arange(1 << self.r))
+
+
+# Registry of the known codes. Nothing is built before being used, so
+# registering a code, or importing the package, costs nothing.
+CODES = {}
+
+def register(code):
+    CODES[code.name] = code
+    return code
+
+register(SecdedCode("hsiao_72_64", matrices.hsiao, 0, 64, "hsiao"))
+register(SecdedCode("lala_73_64", matrices.lala, 9, 0, "lala"))
+register(SecdedCode("d2428", matrices.d2428, 9, 0, "lala"))
+register(SecdedCode("d2332", matrices.d2332, 9, 0, "lala"))
+register(SecdedCode("paperlala_74_64", matrices.paperlala, 0, 64, "paperlala"))
+
+# Short names, handy on the command line
+ALIASES = {
+    "hsiao": "hsiao_72_64",
+    "lala": "lala_73_64",
+    "paperlala": "paperlala_74_64",
+}
+
+def get_code(name):
+    if isinstance(name, SecdedCode):
+        return name
+    name = ALIASES.get(name, name)
+    if name not in CODES:
+        raise KeyError(f"unknown code {name!r}, choose among {', '.join(CODES)}")
+    return CODES[name]
@@ -0,0 +1,110 @@
+#
+# Sharing xors between the check bits, Paar's greedy way: as long as some
+# pair of signals appears in at least two rows, the most frequent pair is
+# computed once by a new 2-input xor and replaced by it in all these rows.
+# C. Paar, "Optimized arithmetic for Reed-Solomon encoders", ISIT 1997.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+# Signals 0 to inputs - 1 are the inputs, signal inputs + g is the output
+# of gate g, whose operands are gates[g] (two of them, or up to the fan-in
+# after balance). outputs[i] lists the signals to xor together for output i.
+XorNet = namedtuple("XorNet", ["inputs", "gates", "outputs"])
+
+# Signals of each mask, lsb first
+def _signals(masks, inputs):
+    return [[b for b in range(0, inputs) if (m >> b) & 1] for m in masks]
+
+# The straightforward network, one xor chain per output
+def flat_net(masks, inputs):
+    return XorNet(inputs, [], _signals(masks, inputs))
+
+def paar(masks, inputs):
+    rows = np.zeros(shape=(len(masks), inputs), dtype=np.int32)
+    for i, s in enumerate(_signals(masks, inputs)):
+        rows[i, s] = 1
+    gates = []
+    while True:
+        # Number of rows holding each pair of signals, first one wins on ties
+        pairs = np.triu(rows.T @ rows, 1)
+        a, b = np.unravel_index(np.argmax(pairs), pairs.shape)
+        if pairs[a, b] < 2:
+            break
+        both = (rows[:, a] & rows[:, b]).astype(bool)
+        rows[both, a] = 0
+        rows[both, b] = 0
+        rows = np.concatenate((rows, both[:, None].astype(np.int32)), axis=1)
+        gates.append((int(a), int(b)))
+    return XorNet(inputs, gates, [np.flatnonzero(row).tolist() for row in rows])
+
+# Number of 2-input xors of the network, a wider gate counting as a
+# chain of 2-input ones
+def xor_count(net):
+    return (sum(len(g) - 1 for g in net.gates) +
+            sum(max(len(o) - 1, 0) for o in net.outputs))
+
+# Depth of each signal in 2-input gate levels, the inputs arriving at the
+# given times (all at 0 by default)
+def signal_depths(net, arrivals=None):
+    depths = list(arrivals) if arrivals is not None else [0] * net.inputs
+    for g in net.gates:
+        depths.append(max(depths[s] for s in g) + 1)
+    return depths
+
+# Operands of the first gate of a tree of the given fan-in over m signals,
+# so that all the others are full, as for Huffman codes of that arity
+def _first(m, fanin):
+    return (m - 2) % (fanin - 1) + 2
+
+# Depth of a tree of gates of the given fan-in combining signals arriving
+# at the given times, the earliest ones always being combined first, so
+# that the late ones end up near the root
+def tree_depth(arrivals, fanin=2):
+    heap = list(arrivals)
+    if not heap:
+        return 0
+    heapq.heapify(heap)
+    take = _first(len(heap), fanin)
+    while len(heap) > 1:
+        ops = [heapq.heappop(heap) for _ in range(0, min(take, len(heap)))]
+        heapq.heappush(heap, max(ops) + 1)
+        take = fanin
+    return heap[0]
+
+# Same network with each output computed by a single balanced tree of
+# gates of the given fan-in, built as tree_depth does from the depths of
+# the signals, inputs arriving at the given times
+def balance(net, fanin=2, arrivals=None):
+    depths = signal_depths(net, arrivals)
+    gates = list(net.gates)
+    outputs = []
+    for o in net.outputs:
+        heap = [(depths[s], s) for s in o]
+        heapq.heapify(heap)
+        take = _first(len(heap), fanin)
+        while len(heap) > 1:
+            ops = [heapq.heappop(heap) for _ in range(0, min(take, len(heap)))]
+            gates.append(tuple(s for _, s in ops))
+            depths.append(max(d for d, _ in ops) + 1)
+            heapq.heappush(heap, (depths[-1], net.inputs + len(gates) - 1))
+            take = fanin
+        outputs.append([s for _, s in heap])
+    return XorNet(net.inputs, gates, outputs)
+
+def output_depths(net, arrivals=None):
+    depths = signal_depths(net, arrivals)
+    return [tree_depth([depths[s] for s in o]) for o in net.outputs]
+
+# Number of gates (or outputs) each input drives
+def fanouts(net):
+    loads = [0] * net.inputs
+    for s in [s for g in net.gates for s in g] + [s for o in net.outputs for s in o]:
+        if s < net.inputs:
+            loads[s] = loads[s] + 1
+    return loads
@@ -0,0 +1,148 @@
+#
+# Syndrome computation and error classification, one word at a time or
+# over whole arrays of codewords given as data and check bit arrays.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import numpy as np
+
+from .encode import checkbits, encode_batch
+
+# Error classes, same values as check_error in lala64.py
+NO_ERROR = 0
+RESIDUE_ERROR = 1
+CHECK_ERROR = 2
+SINGLE_ERROR = 3
+DOUBLE_ERROR = 4
+
+STATUS_NAMES = ["none", "residue", "check", "single", "double"]
+
+# Compute syndrome, the slow way, straight from the matrix
+def compute_syndrome(code, data, check):
+    syndrome = 0
+    for i in range(0, code.r):
+        s = (check >> (code.r - 1 - i)) & 1
+        for b in range(0, code.k):
+            if code.pcm[i, code.data_column(b)] == 1:
+                s = s ^ ((data >> b) & 1)
+        syndrome = (syndrome << 1) | s
+    return syndrome
+
+# The check bits columns are the identity, so the syndrome is the
+# xor of the recomputed check bits with the stored ones
+def syndrome_batch(code, data, check):
+    syndrome = encode_batch(code, data)
+    syndrome ^= np.asarray(check, dtype=np.uint16)
+    return syndrome
+
+# Number of check bits, from check bit 0, holding residues
+RESIDUE_BITS = {"hsiao": 0, "lala": 1, "paperlala": 2}
+
+# Class of each syndrome and bit to flip (-1 for none), by enumerating
+# all single and double errors rather than by rules: the syndrome of a
+# single error is a single error on a data bit, a check bit or a residue
+# bit, the syndrome of a double error is a double error, and so is, as
+# it cannot be corrected, any syndrome no single or double error gives.
+# Also returns which syndromes single or double errors give.
+def class_table(code):
+    r, k = code.r, code.k
+    cols = code.column_syndromes.astype(np.intp)
+    status = np.full(shape=1 << r, fill_value=DOUBLE_ERROR, dtype=np.uint8)
+    bit = np.full(shape=1 << r, fill_value=-1, dtype=np.int16)
+    reached = np.zeros(shape=1 << r, dtype=bool)
+    i, j = np.triu_indices(code.n, 1)
+    reached[cols[i] ^ cols[j]] = True
+    reached[cols] = True
+    status[cols[0:k]] = SINGLE_ERROR
+    status[cols[k:]] = np.where(np.arange(0, r) < RESIDUE_BITS[code.family],
+                                RESIDUE_ERROR, CHECK_ERROR)
+    bit[cols] = np.arange(0, code.n)
+    status[0] = NO_ERROR
+    bit[0] = -1
+    reached[0] = True
+    return status, bit, reached
+
+# Decoders whose classification can be asked for: the rules of the family
+# (check_error and the default modules), which also take for single
+# errors the syndromes that look like a column, or the table from the
+# enumeration of single and double errors (the --rom modules). Every
+# entry point, from classify to the stats, inject and scrubsim reports,
+# takes the rules by default, so that a word gets the same class
+# everywhere.
+DECODERS = ("rules", "table")
+
+def status_of(code, decoder="rules"):
+    if decoder == "table":
+        return code.status_table
+    if decoder == "rules":
+        return code.rule_table
+    raise ValueError(f"unknown decoder {decoder!r}, choose among {', '.join(DECODERS)}")
+
+# Fast classification through the table of the code
+def classify_batch(code, syndromes, decoder="rules"):
+    return status_of(code, decoder)[np.asarray(syndromes, dtype=np.intp)]
+
+def classify(code, syndrome, decoder="rules"):
+    return int(status_of(code, decoder)[syndrome]), int(code.syndrome_to_bit[syndrome])
+
+# Syndromes on which the rules below disagree with the enumeration, as
+# (syndrome, rule class, table class), for the syndromes single and double
+# errors give, which must be empty, and for the other ones
+def rule_mismatches(code):
+    status, _, reached = class_table(code)
+    rules = classify_syndromes(code.family, np.arange(1 << code.r))
+    bad = np.flatnonzero(rules != status)
+    return ([(int(s), int(rules[s]), int(status[s])) for s in bad if reached[s]],
+            [(int(s), int(rules[s]), int(status[s])) for s in bad if not reached[s]])
+
+# Same rules as check_error in lala64.py and paperlala.py, and as the
+# odd-weight-column rule for Hsiao codes
+def classify_syndromes(family, syndromes):
+    syndromes = np.asarray(syndromes, dtype=np.uint16)
+    if family == "hsiao":
+        p = np.bitwise_count(syndromes)
+        return np.select([syndromes == 0, p == 1, (p & 1) == 1],
+                         [NO_ERROR, CHECK_ERROR, SINGLE_ERROR],
+                         DOUBLE_ERROR).astype(np.uint8)
+    if family == "lala":
+        s = syndromes >> 1
+        m = syndromes & 1
+        residue = (m == 1) & (s == 0)
+    elif family == "paperlala":
+        # Two residue bits, m1 and m0
+        s = syndromes >> 2
+        m = syndromes & 3
+        residue = ((m == 1) | (m == 2)) & (s == 0)
+    else:
+        raise ValueError(f"unknown code family {family!r}")
+    p = np.bitwise_count(s)
+    return np.select([syndromes == 0,
+                      residue,
+                      (m == 0) & (p == 1),
+                      ((m == 0) & (p == 3)) | ((m == 1) & (p == 2))],
+                     [NO_ERROR, RESIDUE_ERROR, CHECK_ERROR, SINGLE_ERROR],
+                     DOUBLE_ERROR).astype(np.uint8)
+
+def decode_batch(code, data, check, decoder="rules"):
+    syndrome = syndrome_batch(code, data, check)
+    return syndrome, classify_batch(code, syndrome, decoder)
+
+# Single error correction through the syndrome tables of the code.
+# Returns the corrected data and check bits along with the error class.
+def correct(code, data, check, decoder="rules"):
+    s = checkbits(code, data) ^ check
+    b = int(code.syndrome_to_bit[s])
+    if b >= code.k:
+        check = check ^ (1 << (b - code.k))
+    elif b >= 0:
+        data = data ^ (1 << b)
+    return data, check, int(status_of(code, decoder)[s])
+
+# Bits are flipped on an exact match with a column whatever the decoder,
+# as the compare modules do
+def correct_batch(code, data, check, decoder="rules"):
+    syndrome = syndrome_batch(code, data, check)
+    data = np.asarray(data, dtype=np.uint64) ^ code.flip_data[syndrome]
+    check = np.asarray(check, dtype=np.uint16) ^ code.flip_check[syndrome]
+    return data, check, status_of(code, decoder)[syndrome]
@@ -0,0 +1,81 @@
+#
+# Check bit computation, one word at a time as in the scripts, or over
+# whole arrays of 64-bit words.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import numpy as np
+
+# Words are processed by slices that fit in the cache
+CHUNK = 1 << 16
+
+# Compute check bits, the slow way, straight from the matrix.
+# This is the reference the other engines are compared against.
+def compute_checkbits(code, v):
+    check = 0
+    for i in range(0, code.r):
+        c = 0
+        for b in range(0, code.k):
+            if code.pcm[i, code.data_column(b)] == 1:
+                c = c ^ ((v >> b) & 1)
+        check = (check << 1) | c
+    return check
+
+# Two ways of computing check bits: parity of the word masked by each
+# row of the matrix, or xor of the contributions of each byte read from
+# 8x256 precomputed tables
+ENGINES = ("mask", "table")
+
+# Fast check bit computation for a single word
+def checkbits(code, v, engine=None):
+    engine = engine or code.engine
+    if engine == "table":
+        t = code.byte_lists
+        return (t[0][v & 0xff] ^ t[1][(v >> 8) & 0xff] ^
+                t[2][(v >> 16) & 0xff] ^ t[3][(v >> 24) & 0xff] ^
+                t[4][(v >> 32) & 0xff] ^ t[5][(v >> 40) & 0xff] ^
+                t[6][(v >> 48) & 0xff] ^ t[7][(v >> 56) & 0xff])
+    if engine == "mask":
+        check = 0
+        for m in code.row_masks.tolist():
+            check = (check << 1) | ((v & m).bit_count() & 1)
+        return check
+    raise ValueError(f"unknown engine {engine!r}, choose among {', '.join(ENGINES)}")
+
+def encode_batch(code, words, engine=None):
+    engine = engine or code.engine
+    if engine == "table":
+        return _encode_table(code, words)
+    if engine != "mask":
+        raise ValueError(f"unknown engine {engine!r}, choose among {', '.join(ENGINES)}")
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    check = np.zeros(shape=words.shape, dtype=np.uint16)
+    flat = words.reshape(-1)
+    out = check.reshape(-1)
+    masks = code.row_masks
+    tmp = np.empty(shape=min(CHUNK, flat.size), dtype=np.uint64)
+    par = np.empty(shape=tmp.shape, dtype=np.uint8)
+    for start in range(0, flat.size, CHUNK):
+        w = flat[start:start + CHUNK]
+        o = out[start:start + CHUNK]
+        t = tmp[:w.size]
+        p = par[:w.size]
+        for i in range(0, code.r):
+            np.bitwise_and(w, masks[i], out=t)
+            np.bitwise_count(t, out=p)
+            np.bitwise_and(p, 1, out=p)
+            np.left_shift(o, 1, out=o)
+            np.bitwise_or(o, p, out=o)
+    return check
+
+def _encode_table(code, words):
+    words = np.ascontiguousarray(words, dtype='<u8')
+    nbytes = code.k // 8
+    tables = code.byte_tables
+    # Little endian, so byte b of each word is column b
+    byte = words.reshape(-1).view(np.uint8).reshape(-1, nbytes)
+    check = tables[0][byte[:, 0]]
+    for b in range(1, nbytes):
+        check ^= tables[b][byte[:, b]]
+    return check.reshape(words.shape)
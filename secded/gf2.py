@@ -0,0 +1,118 @@
+#
+# Linear algebra over GF(2) on bit-packed matrices: each row is an
+# integer, the first column being the msb as in PackedPCM, so that adding
+# two rows is a single xor whatever the width of the matrix.
+# Functions working on rows take the number of columns along with them,
+# the _pcm ones take and return 0/1 arrays.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import numpy as np
+
+from .packed import pack_bits
+
+def from_array(a):
+    return [pack_bits(row) for row in np.asarray(a)]
+
+def to_array(rows, ncols, dtype=np.uint32):
+    nbytes = (ncols + 7) // 8
+    buf = b"".join((v << (8 * nbytes - ncols)).to_bytes(nbytes, "big") for v in rows)
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8)).reshape(len(rows), 8 * nbytes)
+    return bits[:, 0:ncols].astype(dtype)
+
+# Rank, keeping one basis vector per leading bit
+def rank(rows):
+    basis = {}
+    for v in rows:
+        while v:
+            h = v.bit_length()
+            if h not in basis:
+                basis[h] = v
+                break
+            v ^= basis[h]
+    return len(basis)
+
+# Reduced row echelon form, without the zero rows, along with the pivot
+# column of each row, in increasing order. The pivot of each step is the
+# remaining row with the leftmost one, so that the number of steps only
+# depends on the number of rows, not of columns.
+def rref(rows, ncols):
+    rows = [v for v in rows if v]
+    pivots = []
+    for i in range(0, len(rows)):
+        p = max(range(i, len(rows)), key=lambda j: rows[j].bit_length())
+        h = rows[p].bit_length()
+        if h == 0:
+            del rows[i:]
+            break
+        rows[i], rows[p] = rows[p], rows[i]
+        bit = 1 << (h - 1)
+        for j in range(0, len(rows)):
+            if j != i and rows[j] & bit:
+                rows[j] ^= rows[i]
+        pivots.append(ncols - h)
+    return rows, pivots
+
+# Basis of the vectors x such that rows . x = 0, one per column that is
+# not a pivot, that column being the only non pivot one set in it
+def null_space(rows, ncols):
+    rows, pivots = rref(rows, ncols)
+    pivot_set = set(pivots)
+    basis = []
+    for f in range(0, ncols):
+        if f in pivot_set:
+            continue
+        bit = 1 << (ncols - 1 - f)
+        v = bit
+        for row, p in zip(rows, pivots):
+            if row & bit:
+                v |= 1 << (ncols - 1 - p)
+        basis.append(v)
+    return basis
+
+# Rows with the columns in the order of perm, column j of the result
+# being column perm[j] of rows
+def permute_columns(rows, ncols, perm):
+    return from_array(to_array(rows, ncols, np.uint8)[:, perm])
+
+# Equivalent matrix of the form [A | I] and the column permutation that
+# leads to it: the pivot columns, which hold the check bits, go last in
+# their order, the others first. Pivots are taken among the prefer
+# columns first, e.g. the check bits of a code, then from the left.
+# Raises ValueError if the rows are not independent.
+def systematic(rows, ncols, prefer=()):
+    prefer = list(prefer)
+    skip = set(prefer)
+    order = prefer + [j for j in range(0, ncols) if j not in skip]
+    reduced, pivots = rref(permute_columns(rows, ncols, order), ncols)
+    if len(reduced) != len(rows):
+        raise ValueError(f"rank {len(reduced)} for {len(rows)} rows")
+    pivots = [order[p] for p in pivots]
+    reduced = permute_columns(reduced, ncols, np.argsort(order))
+    pivot_set = set(pivots)
+    perm = [j for j in range(0, ncols) if j not in pivot_set] + pivots
+    return permute_columns(reduced, ncols, perm), perm
+
+# Generator matrix, in the column order of the parity check matrix: the
+# null space is already systematic on the non pivot columns
+def generator(rows, ncols):
+    return null_space(rows, ncols)
+
+# Whether columns cols of the matrix are independent, i.e. can hold the
+# check bits of a code
+def independent_columns(rows, ncols, cols):
+    sub = permute_columns(rows, ncols, list(cols))
+    return rank(sub) == len(cols)
+
+def rank_pcm(pcm):
+    return rank(from_array(pcm))
+
+def systematic_pcm(pcm, prefer=()):
+    pcm = np.asarray(pcm)
+    rows, perm = systematic(from_array(pcm), pcm.shape[1], prefer)
+    return to_array(rows, pcm.shape[1], pcm.dtype), perm
+
+def generator_pcm(pcm):
+    pcm = np.asarray(pcm)
+    return to_array(generator(from_array(pcm), pcm.shape[1]), pcm.shape[1], pcm.dtype)
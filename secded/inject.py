@@ -0,0 +1,139 @@
+#
+# Monte Carlo fault injection: random words are encoded, hit by errors
+# drawn from an error model, corrected, and the outcome of each trial
+# counted, all by chunks of whole arrays.
+# A model draws, for arrays of data words and check bits, the masks of
+# the bits to flip in each of them; new ones can be added to MODELS.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from math import sqrt
+
+import numpy as np
+
+from .decode import NO_ERROR, DOUBLE_ERROR, correct_batch
+from .encode import encode_batch
+
+CHUNK = 1 << 16
+
+OUTCOMES = ("clean", "corrected", "detected", "miscorrected", "silent")
+
+# Masks of the data and check bits set in a (words, n) array of bits,
+# codeword bits being data bits then check bits as everywhere else
+def pack_masks(code, bits):
+    data = np.packbits(bits[:, 0:code.k], axis=1, bitorder="little")
+    check = np.zeros(shape=(len(bits), 2), dtype=np.uint8)
+    c = np.packbits(bits[:, code.k:], axis=1, bitorder="little")
+    check[:, 0:c.shape[1]] = c
+    return (np.ascontiguousarray(data).view("<u8").reshape(-1),
+            check.view("<u2").reshape(-1).astype(np.uint16))
+
+# Masks with the single codeword bit b of each word set
+def bit_masks(code, b):
+    b = np.asarray(b, dtype=np.int64)
+    data = np.where(b < code.k, np.left_shift(np.uint64(1), np.minimum(b, 63).astype(np.uint64)),
+                    np.uint64(0))
+    check = np.where(b >= code.k, np.left_shift(1, np.maximum(b - code.k, 0)), 0).astype(np.uint16)
+    return data, check
+
+# Each bit of the codeword flipped independently with probability ber:
+# the number of flips of the whole chunk is drawn, then their distinct
+# positions, which is exact at any rate, however low, and only costs
+# as much as there are flips
+def ber_model(rng, code, data, check, ber=1e-3):
+    bits = len(data) * code.n
+    pos = rng.choice(bits, size=rng.binomial(bits, ber), replace=False)
+    word, bit = np.divmod(pos, code.n)
+    d, c = bit_masks(code, bit)
+    dm = np.zeros(len(data), dtype=np.uint64)
+    cm = np.zeros(len(data), dtype=np.uint16)
+    np.bitwise_or.at(dm, word, d)
+    np.bitwise_or.at(cm, word, c)
+    return dm, cm
+
+# Two adjacent bits of the codeword
+def adjacent_model(rng, code, data, check):
+    b = rng.integers(0, code.n - 1, size=len(data))
+    d0, c0 = bit_masks(code, b)
+    d1, c1 = bit_masks(code, b + 1)
+    return d0 | d1, c0 | c1
+
+# Any non zero pattern within one byte of the codeword, the last byte
+# holding what remains after the multiple of 8 bits
+def burst_model(rng, code, data, check, width=8):
+    start = rng.integers(0, (code.n + width - 1) // width, size=len(data)) * width
+    bits = np.zeros(shape=(len(data), code.n), dtype=bool)
+    for i in range(0, width):
+        b = start + i
+        hit = (rng.random(len(data)) < 0.5) & (b < code.n)
+        bits[np.flatnonzero(hit), b[hit]] = True
+    # Draw again the empty patterns by flipping the first bit of the byte
+    empty = ~bits.any(axis=1)
+    bits[np.flatnonzero(empty), start[empty]] = True
+    return pack_masks(code, bits)
+
+# One bit of the codeword stuck at 0 or 1, which is only an error when
+# the word stored there had the other value
+def stuck_model(rng, code, data, check):
+    b = rng.integers(0, code.n, size=len(data))
+    value = rng.integers(0, 2, size=len(data)).astype(np.uint64)
+    d, c = bit_masks(code, b)
+    stored = np.where(b < code.k, (data & d) != 0, (check & c) != 0)
+    flip = stored != value.astype(bool)
+    return np.where(flip, d, np.uint64(0)), np.where(flip, c, np.uint16(0)).astype(np.uint16)
+
+MODELS = {
+    "ber": ber_model,
+    "adjacent": adjacent_model,
+    "burst": burst_model,
+    "stuck": stuck_model,
+}
+
+# Outcome of each trial: no error injected, corrected, detected as
+# uncorrectable, miscorrected (taken for a correctable error, and the
+# word comes out wrong), or silent (not seen at all)
+def outcomes(data, check, data_o, check_o, status, hit):
+    right = (data_o == data) & (check_o == check)
+    return np.select([~hit, status == NO_ERROR, status == DOUBLE_ERROR, right],
+                     [0, 4, 2, 1], 3)
+
+# Wilson score interval of a proportion, 95% by default
+def wilson(count, total, z=1.96):
+    if total == 0:
+        return 0.0, 1.0
+    p = count / total
+    d = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / d
+    half = z * sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / d
+    return max(0.0, center - half), min(1.0, center + half)
+
+# decoder is rules (check_error and the default modules) or table (the
+# --rom modules), see status_of
+def campaign(code, model, trials, seed=0, decoder="rules", chunk=CHUNK, **params):
+    fn = MODELS[model] if isinstance(model, str) else model
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(shape=len(OUTCOMES), dtype=np.int64)
+    for start in range(0, trials, chunk):
+        size = min(chunk, trials - start)
+        data = rng.integers(0, 1 << 64, size=size, dtype=np.uint64)
+        check = encode_batch(code, data)
+        dm, cm = fn(rng, code, data, check, **params)
+        data_o, check_o, status = correct_batch(code, data ^ dm, check ^ cm, decoder)
+        counts += np.bincount(outcomes(data, check, data_o, check_o, status, (dm | cm) != 0),
+                              minlength=len(OUTCOMES))
+    return dict(zip(OUTCOMES, counts.tolist()))
+
+# Proportions among the trials that got an error, with their interval
+def summary(counts):
+    hit = sum(counts[o] for o in OUTCOMES if o != "clean")
+    return {o: (counts[o], *wilson(counts[o], hit)) for o in OUTCOMES if o != "clean"}
+
+def print_campaign(name, model, counts, seconds=None, decoder="rules"):
+    hit = sum(counts[o] for o in OUTCOMES if o != "clean")
+    total = hit + counts["clean"]
+    rate = f", {total / seconds:.3g} trials/s" if seconds else ""
+    print(f"{name} {model}, {decoder} decoder: {total} trials, {hit} with errors{rate}")
+    for o, (n, lo, hi) in summary(counts).items():
+        p = n / hit if hit else 0.0
+        print(f"    {o:<13} {n:>10} {100 * p:8.4f}%  [{100 * lo:.4f}%, {100 * hi:.4f}%]")
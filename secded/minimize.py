@@ -0,0 +1,76 @@
+#
+# Two-level minimization of the flip condition of each bit of the
+# corrector, with the syndromes no single error produces as don't cares.
+# Each condition only has to be true on the syndrome of its own bit, and
+# false on the zero syndrome and on the syndromes of the other bits (and
+# of double errors, when asked to): with 9 syndrome bits, this leaves
+# more than 400 don't cares out of 512, so a couple of literals suffice.
+# The minimizer follows Espresso's expand step: each on-set minterm is
+# expanded into all the largest cubes avoiding the off-set, found exactly
+# by trying literal sets by increasing size, and the on-set is then
+# covered greedily by these cubes, which is exact for single minterms.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from itertools import combinations
+
+import numpy as np
+
+from .stats import combo_syndromes
+
+# A cube is a (care, value) pair of integers: the variables whose bit is
+# set in care are fixed to their bit in value, the other ones are free
+
+def contains(cube, m):
+    care, value = cube
+    return (m & care) == value
+
+def literals(cube):
+    return cube[0].bit_count()
+
+# All the cubes with the fewest literals containing minterm m and none of
+# the off minterms: the care sets are the smallest sets of variables on
+# which m differs from each off minterm
+def expand(m, off, nvars):
+    diff = np.asarray(off, dtype=np.int64) ^ m
+    for size in range(0, nvars + 1):
+        cares = np.array([sum(1 << v for v in c) for c in combinations(range(0, nvars), size)],
+                         dtype=np.int64)
+        ok = np.all((cares[:, None] & diff[None, :]) != 0, axis=1) if len(diff) else np.ones(len(cares), dtype=bool)
+        if ok.any():
+            return [(int(c), m & int(c)) for c in cares[ok]]
+    raise ValueError(f"minterm {m:x} is in the off-set")
+
+# Cubes covering the on-set and avoiding the off-set, anything else being
+# a don't care. Cubes covering the most uncovered minterms are taken
+# first, the ones with fewer literals on ties.
+def cover(on, off, nvars):
+    candidates = {c for m in on for c in expand(m, off, nvars)}
+    left = set(on)
+    cubes = []
+    while left:
+        best = max(sorted(candidates),
+                   key=lambda c: (sum(contains(c, m) for m in left), -literals(c)))
+        cubes.append(best)
+        left = {m for m in left if not contains(best, m)}
+    return cubes
+
+# Minimized flip condition of each bit of the codeword, data bits first
+# then check bits. With keep_double, the syndromes of double errors are
+# in the off-set, so that no bit is ever flipped on a double error;
+# otherwise they are don't cares, the error flags telling them apart.
+def flip_cubes(code, keep_double=False):
+    cols = code.column_syndromes.astype(np.int64)
+    forbidden = {0}
+    if keep_double:
+        forbidden |= set(combo_syndromes(cols, 2).tolist())
+    cubes = []
+    for b in range(0, code.n):
+        off = sorted(forbidden | (set(cols.tolist()) - {int(cols[b])}))
+        cubes.append(cover([int(cols[b])], off, code.r))
+    return cubes
+
+# Literals of the flip conditions of all the bits of the codeword
+def literal_count(cubes):
+    return sum(literals(c) for bit in cubes for c in bit)
@@ -0,0 +1,62 @@
+#
+# Bit-packed parity check matrix: each row and each column is an integer,
+# the first column (resp. row) being the msb, as l2i does in the scripts.
+# Rows are wider than 64 bits for the (73, 64) codes, hence Python ints
+# rather than numpy ones.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from functools import cached_property
+
+import numpy as np
+
+# Make an array of 0s and 1s an integer, msb first, without looping on bits
+def pack_bits(bits):
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    pad = -len(bits) % 8
+    return int.from_bytes(np.packbits(bits).tobytes(), "big") >> pad
+
+class PackedPCM:
+    def __init__(self, pcm):
+        pcm = np.asarray(pcm)
+        self.shape = pcm.shape
+        self.rows = tuple(pack_bits(row) for row in pcm)
+        self.cols = tuple(pack_bits(col) for col in pcm.T)
+
+    def __repr__(self):
+        return f"PackedPCM({self.shape[0]}x{self.shape[1]})"
+
+    # Same matrix, rows and columns swapped, sharing the integers
+    @cached_property
+    def T(self):
+        t = PackedPCM.__new__(PackedPCM)
+        t.shape = (self.shape[1], self.shape[0])
+        t.rows, t.cols = self.cols, self.rows
+        t.__dict__["T"] = self
+        return t
+
+    def bit(self, i, j):
+        return (self.rows[i] >> (self.shape[1] - 1 - j)) & 1
+
+    # Columns start to stop - 1 of row i, column start as msb, e.g.
+    # field(i, 9, 73) is the data mask of row i of a Lala matrix
+    def field(self, i, start, stop):
+        return (self.rows[i] >> (self.shape[1] - stop)) & ((1 << (stop - start)) - 1)
+
+    # Number of ones per row and per column
+    @cached_property
+    def row_weights(self):
+        return tuple(v.bit_count() for v in self.rows)
+
+    @cached_property
+    def col_weights(self):
+        return tuple(v.bit_count() for v in self.cols)
+
+    # Back to the dense 0/1 matrix
+    def unpack(self, dtype=np.uint32):
+        pcm = np.zeros(shape=self.shape, dtype=dtype)
+        for i, v in enumerate(self.rows):
+            for j in range(0, self.shape[1]):
+                pcm[i, j] = (v >> (self.shape[1] - 1 - j)) & 1
+        return pcm
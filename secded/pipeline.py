@@ -0,0 +1,153 @@
+#
+# Pipelined versions of the _dec and _cor modules of dump_prim, for fast
+# memory controllers. The correction goes through three steps, syndrome,
+# flip conditions and error flags, then correction, and registers are
+# inserted after the steps that best balance the logic depth between
+# them. A valid bit follows the words down the pipeline, so that a word
+# can enter at each cycle; there is no back pressure.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import json
+import os
+from contextlib import redirect_stdout
+from itertools import combinations
+
+from .analyze import flip_inputs
+from .cse import output_depths, tree_depth
+from .verilog import _flip, codeword_masks, xor_nets
+
+STEPS = ("syndrome", "flip", "correct")
+
+# Signals still needed after each step
+LIVE = (("valid", "d", "syndrome"),
+        ("valid", "d", "syndrome", "flip", "ne", "se"),
+        ("valid", "out", "syndrome", "err"))
+
+# Depth of each step in 2-input gate levels, as in analyze.py
+def step_depths(code, cmp=True):
+    syndrome = max(output_depths(xor_nets(code, False)["syndrome"]))
+    flip = max([tree_depth([0] * len(flip_inputs(code, b, cmp))) for b in range(0, code.n)] +
+               [tree_depth([0] * code.r)])
+    return [syndrome, flip, 1]
+
+# Steps after which to insert the registers: the ones minimizing the
+# deepest logic between two registers, the logic before the first one and
+# after the last one included, and on ties the ones registering outputs
+def cut_points(depths, stages):
+    def cost(cuts):
+        bounds = [0] + [sum(depths[0:c + 1]) for c in cuts] + [sum(depths)]
+        return max(b - a for a, b in zip(bounds, bounds[1:])), -cuts[-1]
+    return list(min(combinations(range(0, len(STEPS)), stages), key=cost))
+
+# Widths of the signals, data being the whole codeword for the corrector
+# and only the data bits for the decoder once the syndrome is known
+def _widths(code, width):
+    return {"valid": 1, "d": width, "syndrome": code.r, "flip": width,
+            "ne": 1, "se": 1, "out": width, "err": 2}
+
+def _decl(name, w):
+    return f"    logic {'' if w == 1 else f'[{w - 1}:0] '}{name};"
+
+# Registers of the signals live after a cut, the valid bit being the only
+# one reset, the others only loaded along with a valid word
+def _registers(cur, live, widths, c):
+    regs = {s: f"{s}_q{c}" for s in live}
+    print("\n".join(_decl(regs[s], widths[s]) for s in live))
+    print("    always_ff @(posedge clk_i or negedge rst_ni) begin\n"
+          "        if (!rst_ni) begin\n"
+          f"            {regs['valid']} <= 1'b0;\n"
+          "        end else begin\n"
+          f"            {regs['valid']} <= {cur['valid']};\n"
+          "        end\n"
+          "    end\n"
+          "    always_ff @(posedge clk_i) begin\n"
+          f"        if ({cur['valid']}) begin")
+    for s in live:
+        if s != "valid":
+            print(f"            {regs[s]} <= {cur[s]};")
+    print("        end\n"
+          "    end\n")
+    return regs
+
+def _body(code, cmp, cuts, src, width):
+    n, k, r = code.n, code.k, code.r
+    widths = _widths(code, width)
+    cw = codeword_masks(code)
+    nx = (n + 3) // 4
+    cur = {"valid": "valid_i", "d": src}
+    for step in range(0, len(STEPS)):
+        print(f"    // {STEPS[step]}")
+        if step == 0:
+            print(_decl("syndrome", r))
+            for s in range(0, r):
+                print(f"    assign syndrome[{r - 1 - s}] = ^({cur['d']} & {n}'h{cw[s]:0{nx}x});")
+            cur["syndrome"] = "syndrome"
+            if width < n:
+                cur["d"] = f"{cur['d']}[{width - 1}:0]"
+        elif step == 1:
+            print(_decl("flip", width))
+            for d in range(0, width):
+                print(f"    assign flip[{d}] = {_flip(code, d, cmp or d >= k, cur['syndrome'])};")
+            print(_decl("ne", 1))
+            print(_decl("se", 1))
+            print(f"    assign ne = ({cur['syndrome']} == 0);")
+            print(f"    assign se = ^{cur['syndrome']};")
+            cur.update(flip="flip", ne="ne", se="se")
+        else:
+            print(_decl("out", width))
+            print(_decl("err", 2))
+            print(f"    assign out = {cur['d']} ^ {cur['flip']};")
+            print(f"    assign err = {{~({cur['ne']} | {cur['se']}), {cur['se']}}};")
+            cur.update(out="out", err="err")
+        print("")
+        if step in cuts:
+            cur = _registers(cur, LIVE[step], widths, cuts.index(step))
+    print(f"    assign valid_o = {cur['valid']};\n"
+          f"    assign d_o = {cur['out']};\n"
+          f"    assign syndrome_o = {cur['syndrome']};\n"
+          f"    assign err_o = {cur['err']};")
+
+def _module(code, module, cmp, cuts, src, width, stages):
+    n, r = code.n, code.r
+    print(f"module {module} (\n"
+          "    input  logic clk_i,\n"
+          "    input  logic rst_ni,\n"
+          "    input  logic valid_i,\n"
+          f"    input  logic [{n - 1}:0] {src},\n"
+          "    output logic valid_o,\n"
+          f"    output logic [{width - 1}:0] d_o,\n"
+          f"    output logic  [{r - 1}:0] syndrome_o,\n"
+          "    output logic  [1:0] err_o\n);\n")
+    print(f"    localparam int unsigned Latency = {stages};\n")
+    _body(code, cmp, cuts, src, width)
+    print(f"endmodule : {module}")
+
+# Writes the _dec and _cor modules with the given number of register
+# stages (1 to 3), along with a json file giving their latency in cycles,
+# where the registers are and the logic depth of each stage
+def dump_pipelined(code, stages, name=None, cmp=True, outdir="."):
+    if not 1 <= stages <= len(STEPS):
+        raise ValueError(f"between 1 and {len(STEPS)} stages, not {stages}")
+    n, k = code.n, code.k
+    name = name or f"{code.short_name}_{'cmp' if cmp else 'and'}"
+    base = f"prim_secded_{name}_{n}_{k}"
+    depths = step_depths(code, cmp)
+    cuts = cut_points(depths, stages)
+    bounds = [0] + [sum(depths[0:c + 1]) for c in cuts] + [sum(depths)]
+    meta = {"code": code.name, "stages": stages, "latency": stages, "throughput": 1,
+            "cuts": [STEPS[c] for c in cuts],
+            "step_depths": dict(zip(STEPS, depths)),
+            "stage_depths": [b - a for a, b in zip(bounds, bounds[1:]) if b > a],
+            "modules": {}}
+    for kind, src, width in (("dec", "in", k), ("cor", "d_i", n)):
+        module = f"{base}_{kind}_p{stages}"
+        with open(os.path.join(outdir, f"{module}.sv"), "w") as f:
+            with redirect_stdout(f):
+                _module(code, module, cmp, cuts, src, width, stages)
+        meta["modules"][kind] = module
+    with open(os.path.join(outdir, f"{base}_p{stages}.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+        f.write("\n")
+    return meta
@@ -0,0 +1,58 @@
+#
+# Total pairwise Hamming distance of a set of columns, as computed by
+# total_hamming_distance in lala64.py and verilog-dump.py.
+# Each pair of columns differing on a bit position adds 1 to the total,
+# so per position the contribution is the number of ones times the number
+# of zeros, and adding or removing a column only changes r counters.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+class HammingScorer:
+    def __init__(self, cols, r):
+        self.r = r
+        self.n = 0
+        self.ones = [0] * r
+        self.total = 0
+        for c in cols:
+            self.add(c)
+
+    # Sum of the distances between col and the columns of the set
+    def distance(self, col):
+        d = 0
+        for b in range(0, self.r):
+            if (col >> b) & 1:
+                d = d + self.n - self.ones[b]
+            else:
+                d = d + self.ones[b]
+        return d
+
+    # Change of the total if col were added, or removed
+    def delta_add(self, col):
+        return self.distance(col)
+
+    def delta_remove(self, col):
+        # col is in the set, and at distance 0 of itself
+        return -self.distance(col)
+
+    def delta_swap(self, old, new):
+        return self.delta_remove(old) + self.distance(new) - (old ^ new).bit_count()
+
+    def add(self, col):
+        self.total = self.total + self.distance(col)
+        self.n = self.n + 1
+        for b in range(0, self.r):
+            self.ones[b] = self.ones[b] + ((col >> b) & 1)
+
+    def remove(self, col):
+        self.n = self.n - 1
+        for b in range(0, self.r):
+            self.ones[b] = self.ones[b] - ((col >> b) & 1)
+        self.total = self.total - self.distance(col)
+
+    def swap(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+def total_hamming_distance(cols, r):
+    return HammingScorer(cols, r).total
@@ -0,0 +1,114 @@
+#
+# Soft errors accumulating in a whole memory between scrubs.
+# Bit flips arrive at random (a Poisson process, so that their number
+# over a stretch of time is all there is to draw, their word, bit and
+# scrub interval being uniform), and only the words they hit exist: a
+# memory of 10^9 words costs nothing more than one of 10^3.
+# At each scrub, the error accumulated by each word since the previous
+# one goes through the correction of the code, as the error pattern
+# alone decides what the corrector does: corrected, or uncorrectable
+# (detected, miscorrected or silent), in which case the word is dead and
+# left out of the following intervals.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from math import exp
+
+import numpy as np
+
+from .decode import correct_batch
+from .inject import OUTCOMES, bit_masks, outcomes
+
+# Flips drawn at once
+CHUNK = 1 << 20
+
+UNCORRECTABLE = ("detected", "miscorrected", "silent")
+
+# Bit flips per hour in the memory, fit being in failures per 10^9 hours
+# and per Mbit of codewords
+def flip_rate(code, words, fit):
+    return fit * 1e-9 * code.n * words / (1 << 20)
+
+# Errors of the words hit during each scrub interval, as sorted interval
+# and word numbers along with the data and check masks of the flips
+def word_errors(code, words, when, word, bit):
+    key = when.astype(np.int64) * words + word
+    order = np.argsort(key, kind="stable")
+    key, start = np.unique(key[order], return_index=True)
+    dm, cm = bit_masks(code, bit[order])
+    return (key // words, key % words,
+            np.bitwise_xor.reduceat(dm, start), np.bitwise_xor.reduceat(cm, start))
+
+# Simulation of duration hours of a memory scrubbed every interval hours
+# (the last interval, if partial, is left out). Returns the number of
+# flips and of words with each outcome, uncorrectable words counted once.
+def simulate(code, words, fit, interval, duration, seed=0, decoder="rules", chunk=CHUNK):
+    rng = np.random.default_rng(seed)
+    intervals = int(duration // interval)
+    per_interval = flip_rate(code, words, fit) * interval
+    # Intervals drawn at once, about chunk flips worth of them, and at
+    # least one even when there is no interval or no flip
+    step = max(1, min(intervals, int(chunk / per_interval)) if per_interval > 0 else intervals)
+    counts = dict.fromkeys(("flips",) + OUTCOMES[1:], 0)
+    counts["intervals"] = intervals
+    counts["ue_intervals"] = 0
+    dead = np.zeros(0, dtype=np.int64)
+    for first in range(0, intervals, step):
+        last = min(intervals, first + step)
+        flips = rng.poisson(per_interval * (last - first))
+        if flips == 0:
+            continue
+        counts["flips"] += flips
+        when, word, dm, cm = word_errors(code, words,
+                                         rng.integers(first, last, size=flips),
+                                         rng.integers(0, words, size=flips),
+                                         rng.integers(0, code.n, size=flips))
+        # Words dead in an earlier chunk
+        keep = ~np.isin(word, dead)
+        when, word, dm, cm = when[keep], word[keep], dm[keep], cm[keep]
+        # The data is taken as all zeros: correcting the error alone
+        # leaves what remains of it
+        data_o, check_o, status = correct_batch(code, dm, cm, decoder)
+        zero = np.zeros(len(dm), dtype=np.uint64)
+        out = outcomes(zero, zero.astype(np.uint16), data_o, check_o, status, (dm | cm) != 0)
+        # Words dead in this chunk, from their first uncorrectable error
+        ue = np.flatnonzero(out >= 2)
+        died, first_ue = np.unique(word[ue], return_index=True)
+        death = when[ue[first_ue]]
+        later = np.zeros(len(word), dtype=bool)
+        if len(died):
+            pos = np.minimum(np.searchsorted(died, word), len(died) - 1)
+            later = (died[pos] == word) & (when > death[pos])
+        out = out[~later]
+        for i, o in enumerate(OUTCOMES[1:], 1):
+            counts[o] += int(np.count_nonzero(out == i))
+        counts["ue_intervals"] += len(np.unique(death))
+        dead = np.union1d(dead, died)
+    return counts
+
+# Expected uncorrectable words per interval: words hit at least twice
+def expected_ue(code, words, fit, interval):
+    m = flip_rate(code, words, fit) * interval / words
+    return words * (1 - exp(-m) * (1 + m))
+
+# Simulations for a range of scrub intervals, with the probability that
+# an interval ends with an uncorrectable error
+def sweep(code, words, fit, intervals, duration, seed=0, decoder="rules"):
+    results = []
+    for interval in intervals:
+        c = simulate(code, words, fit, interval, duration, seed, decoder)
+        c["interval"] = interval
+        c["p_ue"] = c["ue_intervals"] / c["intervals"] if c["intervals"] else 0.0
+        c["expected_p_ue"] = 1 - exp(-expected_ue(code, words, fit, interval))
+        results.append(c)
+    return results
+
+def print_sweep(code, words, fit, duration, results, decoder="rules"):
+    print(f"{code.name}, {decoder} decoder: {words} words, {fit:g} FIT/Mbit, "
+          f"{flip_rate(code, words, fit):.4g} flips/hour, {duration:g} hours")
+    print(f"    {'interval':>9} {'flips':>10} {'corrected':>10} {'detected':>9} "
+          f"{'miscorr.':>9} {'silent':>7} {'P(UE)':>10} {'expected':>10}")
+    for c in results:
+        print(f"    {c['interval']:>9g} {c['flips']:>10} {c['corrected']:>10} {c['detected']:>9} "
+              f"{c['miscorrected']:>9} {c['silent']:>7} {c['p_ue']:>10.3e} {c['expected_p_ue']:>10.3e}")
@@ -0,0 +1,103 @@
+#
+# Search for Lala-like (73, 64) matrices, as verilog-dump.py does: the 9
+# check bit columns and the 28 data columns with the residue bit set are
+# kept from Lala's matrix, and the 36 remaining data columns are picked
+# among the 56 weight-3 columns without residue bit.
+# Candidates are drawn and scored by batches on a process pool, each
+# worker having its own random stream, and only the best ones are kept.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import matrices
+from .packed import PackedPCM
+from .verify import valid_batch
+
+r = 9      # Rows of the matrix, including the residue one
+FIXED = 37 # Columns kept from Lala's matrix
+PICK = 36  # Columns picked from the pool
+
+# Candidates are drawn and scored by batches of this size, and the work
+# split in at most that many independent tasks
+BATCH = 1024
+TASKS = 64
+
+# Column syndromes of the fixed part, msb first as in the matrix
+def fixed_columns():
+    return np.array(PackedPCM(matrices.lala()).cols[0:FIXED], dtype=np.intp)
+
+# The 56 weight-3 columns, in the order of distinct_permutations in
+# verilog-dump.py, with a 0 residue bit
+def pool_columns():
+    return np.array([v << 1 for v in range(0, 256) if v.bit_count() == 3], dtype=np.intp)
+
+# Matrix in the same format as lala, from the indices of the picked columns
+def candidate_pcm(picked):
+    cols = np.concatenate((fixed_columns(), pool_columns()[np.sort(picked)]))
+    pcm = np.zeros(shape=(r, len(cols)), dtype=np.uint32)
+    for i in range(0, r):
+        pcm[i] = (cols >> (r - 1 - i)) & 1
+    return pcm
+
+# Scores of a batch of candidates given as column syndromes
+def score_batch(cols):
+    bits = (cols[:, :, None] >> np.arange(r - 1, -1, -1)) & 1
+    rows = bits.sum(axis=1)
+    # Total Hamming distance of the picked columns, see score.py
+    ones = bits[:, FIXED:, :].sum(axis=1)
+    thd = (ones * (cols.shape[1] - FIXED - ones)).sum(axis=1)
+    # The residue row, the last one, holds the 28 fixed residue columns
+    # whatever the pick, so the xor depth the pick controls is the one of
+    # the other rows
+    return {"ones": rows.sum(axis=1),
+            "max_row": rows[:, 0:r - 1].max(axis=1),
+            "thd": thd,
+            "valid": valid_batch(cols, r, "lala")}
+
+# Valid candidates first, then the lowest maximum row weight (the xor
+# depth), the fewest ones, and the largest total Hamming distance
+def _order(scores):
+    return np.lexsort((-scores["thd"], scores["ones"], scores["max_row"], ~scores["valid"]))
+
+def _best(picked, scores, top):
+    o = _order(scores)[:top]
+    return picked[o], {key: v[o] for key, v in scores.items()}
+
+def _search_worker(seed, count, top):
+    rng = np.random.default_rng(seed)
+    fixed = fixed_columns()
+    pool = pool_columns()
+    best = None
+    for start in range(0, count, BATCH):
+        b = min(BATCH, count - start)
+        picked = np.sort(rng.random((b, len(pool))).argsort(axis=1)[:, :PICK], axis=1)
+        cols = np.concatenate((np.broadcast_to(fixed, (b, FIXED)), pool[picked]), axis=1)
+        scores = score_batch(cols)
+        if best is not None:
+            picked = np.concatenate((best[0], picked))
+            scores = {key: np.concatenate((best[1][key], v)) for key, v in scores.items()}
+        best = _best(picked, scores, top)
+    return best
+
+# Draw count candidates over the workers and return the top best ones,
+# as a list of dicts holding the picked pool indices and the scores
+def search(count, top=10, seed=0xdeadbeef, workers=None):
+    # The split does not depend on the number of workers, so that a given
+    # seed always gives the same result
+    tasks = max(1, min(TASKS, count // BATCH))
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+    counts = [count // tasks + (i < count % tasks) for i in range(0, tasks)]
+    if tasks == 1 or workers == 1:
+        results = [_search_worker(s, c, top) for s, c in zip(seeds, counts)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_search_worker, seeds, counts, [top] * len(seeds)))
+    picked = np.concatenate([p for p, _ in results])
+    scores = {key: np.concatenate([s[key] for _, s in results]) for key in results[0][1]}
+    picked, scores = _best(picked, scores, top)
+    return [{"picked": picked[c].tolist(), **{key: v[c].item() for key, v in scores.items()}}
+            for c in range(len(picked))]
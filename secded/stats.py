@@ -0,0 +1,74 @@
+#
+# Behaviour of the codes under errors of 3 bits or more.
+# As for the verifier, the syndrome of an error pattern is the xor of the
+# columns of its erroneous bits, so patterns are enumerated through their
+# syndromes only, and then classified through the syndrome table.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+
+import numpy as np
+
+from .decode import NO_ERROR, DOUBLE_ERROR, status_of
+
+OUTCOMES = ("undetected", "miscorrected", "detected")
+
+# Weights from which the work is spread over a process pool
+PARALLEL_WEIGHT = 4
+
+# Syndromes of all the weight w error patterns on the given columns
+def combo_syndromes(cols, w):
+    if w == 1:
+        return cols.copy()
+    if w == 2:
+        i, j = np.triu_indices(len(cols), 1)
+        return cols[i] ^ cols[j]
+    parts = [cols[i] ^ combo_syndromes(cols[i + 1:], w - 1)
+             for i in range(0, len(cols) - w + 1)]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=cols.dtype)
+
+# Number of weight w patterns whose lowest erroneous bit is first, per syndrome
+def _histogram(cols, w, first, size):
+    if w == 1:
+        s = cols[first:first + 1]
+    else:
+        s = cols[first] ^ combo_syndromes(cols[first + 1:], w - 1)
+    return np.bincount(s, minlength=size)
+
+def syndrome_histogram(cols, w, size, workers=None):
+    n = len(cols)
+    firsts = range(0, n - w + 1)
+    if w < PARALLEL_WEIGHT or workers == 1:
+        hists = [_histogram(cols, w, f, size) for f in firsts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hists = list(pool.map(_histogram, [cols] * len(firsts), [w] * len(firsts),
+                                  firsts, [size] * len(firsts)))
+    return np.sum(hists, axis=0, dtype=np.int64)
+
+# Count, for each weight, the patterns that go undetected (zero syndrome),
+# that are miscorrected (taken for a correctable single error) and that
+# are detected as uncorrectable, by the given decoder (see status_of)
+def error_stats(code, weights=(3, 4), workers=None, decoder="rules"):
+    cols = code.column_syndromes.astype(np.intp)
+    status = status_of(code, decoder)
+    stats = {}
+    for w in weights:
+        hist = syndrome_histogram(cols, w, 1 << code.r, workers)
+        undetected = int(hist[0])
+        detected = int(hist[status == DOUBLE_ERROR].sum())
+        miscorrected = int(hist[status != NO_ERROR].sum()) - detected
+        assert undetected + miscorrected + detected == comb(code.n, w)
+        stats[w] = {"patterns": comb(code.n, w), "undetected": undetected,
+                    "miscorrected": miscorrected, "detected": detected}
+    return stats
+
+def print_stats(name, stats, decoder="rules"):
+    print(f"{name}, {decoder} decoder")
+    print(f"{'w':>3} {'patterns':>10} " + " ".join(f"{o:>14}" for o in OUTCOMES))
+    for w, s in stats.items():
+        print(f"{w:>3} {s['patterns']:>10} " +
+              " ".join(f"{s[o]:>7} {100 * s[o] / s['patterns']:5.1f}%" for o in OUTCOMES))
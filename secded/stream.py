@@ -0,0 +1,100 @@
+#
+# Encoding of files of little-endian 64-bit words, such as memory images.
+# Files are memory-mapped and processed by chunks, so that they never
+# have to fit in memory.
+# Check bits are either written to a sidecar file, one check_dtype value
+# per word, or interleaved with the data as packed (data, check) records.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import os
+
+import numpy as np
+
+from .encode import encode_batch
+
+# Words per chunk, 8 MiB of data
+CHUNK = 1 << 20
+
+# Packed records, without any padding between data and check bits
+def record_dtype(code):
+    return np.dtype([("data", "<u8"), ("check", code.check_dtype)])
+
+# Read-only map of a file of 64-bit words
+def map_words(path, mode="r"):
+    size = os.path.getsize(path)
+    if size % 8 != 0:
+        raise ValueError(f"{path}: size {size} is not a multiple of 8 bytes")
+    if size == 0:
+        return np.zeros(0, dtype="<u8")
+    return np.memmap(path, dtype="<u8", mode=mode)
+
+# Returns the number of words encoded
+def encode_file(code, src, dst, interleave=False, chunk=CHUNK, engine=None):
+    data = map_words(src)
+    if interleave:
+        record = np.empty(min(chunk, len(data)), dtype=record_dtype(code))
+    with open(dst, "wb") as f:
+        for start in range(0, len(data), chunk):
+            w = data[start:start + chunk]
+            c = encode_batch(code, w, engine)
+            if interleave:
+                rec = record[:len(w)]
+                rec["data"] = w
+                rec["check"] = c
+                rec.tofile(f)
+            else:
+                c.astype(code.check_dtype).tofile(f)
+    return len(data)
+
+# Scrubbing of an encoded file: single errors are corrected in place
+# through the syndrome tables of the code, and each event is written to
+# report as "<word offset> <event> <bit>", events being
+#   corrected:     a data bit has been flipped back
+#   check:         the error was in the check (or residue) bits only
+#   uncorrectable: the syndrome matches no single error
+# Returns the number of words and of events of each kind.
+EVENTS = ("corrected", "check", "uncorrectable")
+
+# Writable maps of the data and check bits, from a sidecar file or from
+# interleaved records when check is None
+def _map_encoded(code, src, check):
+    if check is None:
+        if os.path.getsize(src) == 0:
+            return np.zeros(0, dtype="<u8"), np.zeros(0, dtype=code.check_dtype), []
+        rec = np.memmap(src, dtype=record_dtype(code), mode="r+")
+        return rec["data"], rec["check"], [rec]
+    data = map_words(src, "r+")
+    if os.path.getsize(check) == 0:
+        checkbits = np.zeros(0, dtype=code.check_dtype)
+    else:
+        checkbits = np.memmap(check, dtype=code.check_dtype, mode="r+")
+    if len(checkbits) != len(data):
+        raise ValueError(f"{check}: {len(checkbits)} check bits for {len(data)} words")
+    return data, checkbits, [m for m in (data, checkbits) if isinstance(m, np.memmap)]
+
+def scrub_file(code, src, check=None, report=None, chunk=CHUNK, engine=None):
+    data, checkbits, maps = _map_encoded(code, src, check)
+    counts = dict.fromkeys(EVENTS, 0)
+    for start in range(0, len(data), chunk):
+        w = data[start:start + chunk]
+        c = checkbits[start:start + chunk]
+        syndrome = encode_batch(code, w, engine)
+        syndrome ^= c
+        err = np.flatnonzero(syndrome)
+        if len(err) == 0:
+            continue
+        s = syndrome[err]
+        bit = code.syndrome_to_bit[s]
+        fix = bit >= 0
+        w[err[fix]] ^= code.flip_data[s[fix]]
+        c[err[fix]] ^= code.flip_check[s[fix]].astype(code.check_dtype)
+        for offset, b in zip((err + start).tolist(), bit.tolist()):
+            event = "uncorrectable" if b < 0 else "check" if b >= code.k else "corrected"
+            counts[event] = counts[event] + 1
+            if report is not None:
+                report.write(f"{offset:#x} {event} {b}\n")
+    for m in maps:
+        m.flush()
+    return len(data), counts
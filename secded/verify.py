@@ -0,0 +1,84 @@
+#
+# Exhaustive check of the SEC-DED properties of a parity check matrix.
+# The syndrome is linear and does not depend on the data, so the syndrome
+# of an error pattern is the xor of the columns of its erroneous bits, and
+# all single and double errors are checked at once from the columns.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from collections import namedtuple
+
+import numpy as np
+
+from .decode import NO_ERROR, DOUBLE_ERROR, classify_syndromes
+from .gf2 import independent_columns
+from .packed import PackedPCM
+
+# Columns i and j are matrix column indices, j is -1 for single errors
+Violation = namedtuple("Violation", ["kind", "i", "j", "syndrome"])
+
+# Returns the list of violations, empty when the matrix is SEC-DED.
+# When the family is given, the syndromes must moreover be classified
+# properly by its rules (see classify_batch). When the columns of the
+# check bits are given, they must be independent for the encoder to
+# solve for them.
+def verify_pcm(pcm, family=None, check_cols=None):
+    violations = []
+    packed = PackedPCM(pcm)
+    cols = np.array(packed.cols, dtype=np.uint16)
+    n = len(cols)
+
+    if check_cols is not None and not independent_columns(packed.rows, n, check_cols):
+        violations.append(Violation("dependent check columns", check_cols[0], check_cols[-1], 0))
+
+    # Every single error gets a non zero syndrome, distinct from the others
+    for i in np.flatnonzero(cols == 0):
+        violations.append(Violation("undetected single", int(i), -1, 0))
+    if family is not None:
+        status = classify_syndromes(family, cols)
+        for i in np.flatnonzero((status == NO_ERROR) | (status == DOUBLE_ERROR)):
+            violations.append(Violation("uncorrectable single", int(i), -1, int(cols[i])))
+
+    # Every double error is detected, and never taken for a single one
+    i, j = np.triu_indices(n, 1)
+    double = cols[i] ^ cols[j]
+    bad = double == 0
+    for a, b in zip(i[bad], j[bad]):
+        violations.append(Violation("undetected double", int(a), int(b), 0))
+    bad = ~bad & np.isin(double, cols)
+    for a, b, s in zip(i[bad], j[bad], double[bad]):
+        violations.append(Violation("miscorrected double", int(a), int(b), int(s)))
+    if family is not None:
+        bad = (double != 0) & (classify_syndromes(family, double) != DOUBLE_ERROR)
+        for a, b, s in zip(i[bad], j[bad], double[bad]):
+            violations.append(Violation("misclassified double", int(a), int(b), int(s)))
+    return violations
+
+# Same check for a batch of candidate matrices given as column syndromes,
+# one candidate per row, only telling which candidates are SEC-DED
+def valid_batch(cols, r, family=None):
+    cols = np.asarray(cols, dtype=np.intp)
+    valid = np.all(cols != 0, axis=1)
+    present = np.zeros(shape=(len(cols), 1 << r), dtype=bool)
+    np.put_along_axis(present, cols, True, axis=1)
+    valid &= present.sum(axis=1) == cols.shape[1]
+    i, j = np.triu_indices(cols.shape[1], 1)
+    double = cols[:, i] ^ cols[:, j]
+    valid &= ~np.any(np.take_along_axis(present, double, axis=1), axis=1)
+    if family is not None:
+        status = classify_syndromes(family, np.arange(1 << r))
+        valid &= np.all((status[cols] != NO_ERROR) & (status[cols] != DOUBLE_ERROR), axis=1)
+        valid &= np.all(status[double] == DOUBLE_ERROR, axis=1)
+    return valid
+
+def verify(code):
+    return verify_pcm(code.pcm, code.family, range(code.check_col, code.check_col + code.r))
+
+def report(name, violations):
+    if not violations:
+        print(f"{name}: SEC-DED")
+        return
+    print(f"{name}: {len(violations)} violations")
+    for v in violations:
+        print(f"    {v.kind}: columns {v.i} {v.j}, syndrome {v.syndrome:03x}")
@@ -0,0 +1,256 @@
+#
+# Dump something looking like Verilog, moved from the scripts so that
+# emitting it is an explicit action (python -m secded verilog) rather
+# than a side effect of importing them.
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+import os
+from contextlib import redirect_stdout
+
+from .cse import balance, flat_net, output_depths, paar, xor_count
+
+# Codeword bit positions covered by each row of the matrix, data bits at
+# the bottom and check bits on top, as seen by the prim_secded modules.
+# Check bit j is read from the check columns with check bit r - 1 as msb.
+def codeword_masks(code):
+    p = code.packed
+    return [(p.field(i, code.check_col, code.check_col + code.r) << code.k) |
+            p.field(i, code.data_col, code.data_col + code.k)
+            for i in range(0, code.r)]
+
+# Case statement giving, for each syndrome, its class and the bit to flip
+# (all ones for none), from the enumeration of all single and double
+# errors (see class_table), class_o using the values of decode.py
+def _rom(code):
+    from .decode import NO_ERROR, DOUBLE_ERROR, STATUS_NAMES, class_table
+    n, k, r = code.n, code.k, code.r
+    status, bit, _ = class_table(code)
+    w = n.bit_length()
+    rx = (r + 3) // 4
+    none = (1 << w) - 1
+    print(f"    // class_o: " + ", ".join(f"{c} {name}" for c, name in enumerate(STATUS_NAMES)))
+    print(f"    logic [{w - 1}:0] pos;")
+    print("    always_comb begin : p_classify\n"
+          "        unique case (syndrome_o)")
+    for s in range(0, 1 << r):
+        if status[s] != DOUBLE_ERROR:
+            b = none if bit[s] < 0 else int(bit[s])
+            print(f"            {r}'h{s:0{rx}x}: begin class_o = 3'd{status[s]}; pos = {w}'d{b}; end")
+    print(f"            default: begin class_o = 3'd{DOUBLE_ERROR}; pos = {w}'d{none}; end\n"
+          "        endcase\n"
+          "    end")
+    # Shifting by a check bit position or more leaves the data untouched
+    print(f"    assign d_o = in[{k - 1}:0] ^ ({k}'(1) << pos);")
+    print(f"    assign err_o = {{class_o == 3'd{DOUBLE_ERROR}, "
+          f"class_o != 3'd{NO_ERROR} && class_o != 3'd{DOUBLE_ERROR}}};")
+
+# Condition on the syndrome for flipping bit b of the codeword: either a
+# full compare, or an and of the syndrome bits set in its column, or the
+# minimized cubes of minimize.py when given
+def _flip(code, b, cmp, syndrome="syndrome_o", cubes=None):
+    if cubes is not None:
+        return " | ".join(_cube(code.r, c, syndrome) for c in cubes[b])
+    s = int(code.column_syndromes[b])
+    if cmp:
+        return f"({syndrome} == {code.r}'h{s:0{(code.r + 3) // 4}x})"
+    bits = [f"{syndrome}[{i}]" for i in range(code.r - 1, -1, -1) if (s >> i) & 1]
+    return "(" + " & ".join(bits) + ")"
+
+def _cube(r, cube, syndrome):
+    care, value = cube
+    bits = [f"{'' if (value >> i) & 1 else '~'}{syndrome}[{i}]"
+            for i in range(r - 1, -1, -1) if (care >> i) & 1]
+    return "(" + (" & ".join(bits) or "1'b1") + ")"
+
+# Shared xors as named wires, and the xor of the remaining signals of
+# each output, src being the name of the input vector
+def _xor_terms(net, src, indent="    "):
+    def name(s):
+        return f"{src}[{s}]" if s < net.inputs else f"x{s - net.inputs}"
+    wires = [f"{indent}wire x{g} = {' ^ '.join(name(s) for s in ops)};"
+             for g, ops in enumerate(net.gates)]
+    # A row may cover no data bit at all, as the residue rows of paperlala
+    return wires, [" ^ ".join(name(s) for s in reversed(o)) or "1'b0" for o in net.outputs]
+
+# Arrival time of each codeword bit, the missing ones arriving at 0
+def _arrivals(code, arrivals):
+    return (list(arrivals or []) + [0] * code.n)[0:code.n]
+
+# Xor networks of the check bits (over the data bits) and of the syndrome
+# (over the codeword bits), factored or not.
+# With a fan-in, each bit is moreover a balanced tree of gates of that
+# fan-in, taking into account the arrival times of the codeword bits
+# (data bits then check bits, in gate levels) when given.
+def xor_nets(code, cse=True, fanin=None, arrivals=None):
+    net = paar if cse else flat_net
+    nets = {"enc": net([int(m) for m in code.row_masks], code.k),
+            "syndrome": net(codeword_masks(code), code.n)}
+    if fanin:
+        arrivals = _arrivals(code, arrivals)
+        nets = {"enc": balance(nets["enc"], fanin, arrivals[0:code.k]),
+                "syndrome": balance(nets["syndrome"], fanin, arrivals)}
+    return nets
+
+# Logic depth of each check bit and syndrome bit of the networks, in gates
+# of the fan-in of the networks
+def xor_depths(code, nets, arrivals=None):
+    arrivals = _arrivals(code, arrivals)
+    return {"enc": output_depths(nets["enc"], arrivals[0:code.k]),
+            "syndrome": output_depths(nets["syndrome"], arrivals)}
+
+# Number of 2-input xors before and after factoring
+def xor_gates(code):
+    flat, shared = xor_nets(code, False), xor_nets(code, True)
+    return {key: (xor_count(flat[key]), xor_count(shared[key])) for key in flat}
+
+def _syndrome(net, src, r):
+    wires, exprs = _xor_terms(net, src)
+    print("\n".join(wires))
+    for s in range(0, r):
+        print(f"    assign syndrome_o[{r - 1 - s}] = {exprs[s]};")
+
+# Following the lowrisc example, we concatenate the check bits
+# on the MSB, as opposed to what the matrix says, but this
+# should not change much.
+# With cse, the xors shared by the rows are computed once, see cse.py,
+# and with a fan-in they are written as balanced trees (see xor_nets).
+# With cubes (see minimize.py), the flip conditions of all the bits are
+# the minimized ones instead of compares or ands, and with rom the decoder
+# looks the syndrome up in the class table of the code (see _rom).
+# Returns the logic depth of each check bit and syndrome bit.
+def dump_prim(code, name=None, cmp=True, outdir=".", cse=False, fanin=None, arrivals=None,
+              cubes=None, rom=False):
+    n, k, r = code.n, code.k, code.r
+    name = name or f"{code.short_name}_{'min' if cubes else 'rom' if rom else 'cmp' if cmp else 'and'}"
+    prefix = os.path.join(outdir, f"prim_secded_{name}_{n}_{k}")
+    module = f"prim_secded_{name}_{n}_{k}"
+    cw = codeword_masks(code)
+    nets = xor_nets(code, cse, fanin, arrivals) if cse or fanin else None
+    kx = (k + 3) // 4
+    nx = (n + 3) // 4
+    with open(f"{prefix}_enc.sv", "w") as f:
+        with redirect_stdout(f):
+            print(f"module {module}_enc (\n"
+                  f"    input  logic [{k - 1}:0] in,\n"
+                  f"    output logic [{n - 1}:0] out\n);")
+            if nets is not None:
+                wires, exprs = _xor_terms(nets["enc"], "in")
+                print("\n" + "\n".join(wires))
+                print(f"    assign out[{k - 1}:0] = in;")
+                for c in range(0, r):
+                    print(f"    assign out[{n - 1 - c}] = {exprs[c]};")
+                print(f"endmodule : {module}_enc")
+            else:
+                print("    always_comb begin : p_encode\n"
+                      f"        out[{k - 1}:0] = in;")
+                for c in range(0, r):
+                    print(f"        out[{n - 1 - c}] = ^(in & {k}'h{int(code.row_masks[c]):0{kx}x});")
+                print(f"    end\nendmodule : {module}_enc")
+
+    with open(f"{prefix}_dec.sv", "w") as f:
+        with redirect_stdout(f):
+            print(f"module {module}_dec (\n"
+                  f"    input  logic [{n - 1}:0] in,\n"
+                  f"    output logic [{k - 1}:0] d_o,\n"
+                  f"    output logic  [{r - 1}:0] syndrome_o,\n" +
+                  ("    output logic  [1:0] err_o,\n"
+                   "    output logic  [2:0] class_o\n);\n" if rom else
+                   "    output logic  [1:0] err_o\n);\n"))
+            if nets is not None:
+                _syndrome(nets["syndrome"], "in", r)
+            else:
+                for s in range(0, r):
+                    print(f"    assign syndrome_o[{r - 1 - s}] = ^(in & {n}'h{cw[s]:0{nx}x});")
+            if rom:
+                _rom(code)
+            else:
+                for d in range(0, k):
+                    print(f"    assign d_o[{d}] = {_flip(code, d, cmp, cubes=cubes)} ^ in[{d}];")
+                print("    logic       ne = (syndrome_o == 0);")
+                print("    logic se = ^syndrome_o;")
+                print("    assign err_o = {~(ne | se), se};")
+            print(f"endmodule : {module}_dec")
+
+    with open(f"{prefix}_cor.sv", "w") as f:
+        with redirect_stdout(f):
+            print(f"module {module}_cor (\n"
+                  f"    input  logic [{n - 1}:0] d_i,\n"
+                  f"    output logic [{n - 1}:0] d_o,\n"
+                  f"    output logic  [{r - 1}:0] syndrome_o,\n"
+                  "    output logic  [1:0] err_o\n);\n")
+            if nets is not None:
+                _syndrome(nets["syndrome"], "d_i", r)
+            else:
+                for s in range(0, r):
+                    print(f"    assign syndrome_o[{r - 1 - s}] = ^(d_i & {n}'h{cw[s]:0{nx}x});")
+            # Check bits are always compared, their columns have a single one
+            for d in range(0, n):
+                print(f"    assign d_o[{d}] = {_flip(code, d, cmp or d >= k, cubes=cubes)} ^ d_i[{d}];")
+            print("    logic       ne = (syndrome_o == 0);")
+            print("    logic se = ^syndrome_o;")
+            print("    assign err_o = {~(ne | se), se};")
+            print(f"endmodule : {module}_cor")
+    return xor_depths(code, nets or xor_nets(code, False), arrivals)
+
+# Several independent files, one xor chain per check bit, as in hsiao64.py.
+# Here c[i] is the check bit of row i of the matrix.
+# With cse, the xors shared by the rows are computed once, see cse.py,
+# and with a fan-in they are written as balanced trees (see xor_nets).
+# Returns the logic depth of each check bit and syndrome bit.
+def dump_hsiao(code, name=None, outdir=".", cse=False, fanin=None, arrivals=None):
+    k, r = code.k, code.r
+    name = name or code.short_name
+    nets = xor_nets(code, cse, fanin, arrivals)
+    wires, exprs = _xor_terms(nets["enc"], "d", "")
+    with open(os.path.join(outdir, f"compute_checkbits_{name}.v"), "w") as f:
+        with redirect_stdout(f):
+            print(f"module compute_checkbits_{name} (\n",
+                  f"    input  wire [{k - 1}:0] d,\n",
+                  f"    output wire  [{r - 1}:0] c\n);\n")
+            for w in wires:
+                print(w)
+            for c in range(0, r):
+                print(f"assign c[{c}] = {exprs[c]};")
+            print("endmodule")
+
+    with open(os.path.join(outdir, f"compute_syndrome_{name}.v"), "w") as f:
+        with redirect_stdout(f):
+            print(f"module compute_syndrome_{name} (\n",
+                  f"    input  wire [{k - 1}:0] d,\n",
+                  f"    input  wire  [{r - 1}:0] c,\n",
+                  f"    output wire  [{r - 1}:0] s\n);\n")
+            for w in wires:
+                print(w)
+            for s in range(0, r):
+                print(f"assign s[{s}] = {exprs[s]} ^ c[{s}];")
+            print("endmodule")
+
+    with open(os.path.join(outdir, f"check_syndrome_{name}.v"), "w") as f:
+        with redirect_stdout(f):
+            print(f"module check_syndrome_{name} (\n",
+                  f"    input  wire  [{r - 1}:0] syndrome,\n",
+                  "    output wire        ne, // no error\n",
+                  "    output wire        se, // single bit error\n",
+                  "    output wire        de  // double bit error\n",
+                  ");\n")
+            print(f"assign ne = syndrome == 0;")
+            print("assign se = " + " ^ ".join(f"syndrome[{i}]" for i in range(r - 1, -1, -1)) + ";")
+            print(f"assign de = (syndrome != 0) && !se;")
+            print("endmodule")
+
+    # The syndrome bits are the check bits xored with the stored ones
+    depths = xor_depths(code, nets, arrivals)
+    arrivals = _arrivals(code, arrivals)
+    depths["syndrome"] = [max(d, arrivals[k + r - 1 - s]) + 1 for s, d in enumerate(depths["enc"])]
+    return depths
+
+# Hsiao codes get the hsiao64.py files, the others, and Hsiao's when a
+# minimized corrector or a class table is asked for, the prim_secded ones
+def dump_verilog(code, cmp=True, outdir=".", cse=False, fanin=None, arrivals=None, cubes=None,
+                 rom=False):
+    if code.family == "hsiao" and cubes is None and not rom:
+        return dump_hsiao(code, outdir=outdir, cse=cse, fanin=fanin, arrivals=arrivals)
+    return dump_prim(code, cmp=cmp, outdir=outdir, cse=cse, fanin=fanin, arrivals=arrivals,
+                     cubes=cubes, rom=rom)
@@ -0,0 +1,93 @@
+#
+# Exact weight distribution of the codes, through the MacWilliams
+# identity: the dual code, spanned by the rows of the parity check
+# matrix, only has 2^r codewords, so its weights are enumerated and
+# transformed into the 2^k weights of the code.
+# The outcome of an error pattern only depends on its syndrome, so the
+# probability of each outcome on a binary symmetric channel follows:
+# an error is undetected when it is a codeword, and miscorrected when it
+# is one bit away from a non zero codeword, as its syndrome is then the
+# one of that bit; the number of such patterns of weight w is
+#   N_w = (w + 1) A_{w+1} + (n - w + 1) A_{w-1}
+# each pattern being one bit away from a single codeword (d = 4).
+# Such a pattern is miscorrected, and any other detected, by the table
+# decoder only, which flips a bit on an exact match with a column: the
+# rules of the default modules also take for single errors syndromes
+# that are no column, which the weights cannot see (see status_of).
+#
+# (c) 2025 Frédéric Pétrot <frederic.petrot@univ-grenoble-alpes.fr>
+#
+
+from math import comb
+
+import numpy as np
+
+from .gf2 import from_array, rref
+
+# Number of codewords of the dual code of each weight, 0 to n
+def dual_weights(pcm):
+    pcm = np.asarray(pcm)
+    n = pcm.shape[1]
+    basis, _ = rref(from_array(pcm), n)
+    words = [0]
+    for v in basis:
+        words += [w ^ v for w in words]
+    return np.bincount([w.bit_count() for w in words], minlength=n + 1).tolist()
+
+# Krawtchouk polynomial K_w(j) for length n
+def krawtchouk(n, w, j):
+    return sum((-1) ** s * comb(j, s) * comb(n - j, w - s) for s in range(0, min(w, j) + 1))
+
+# Number of codewords of each weight, 0 to n, as exact integers
+def weight_distribution(pcm):
+    b = dual_weights(pcm)
+    n = len(b) - 1
+    size = sum(b)
+    dual = [j for j in range(0, n + 1) if b[j]]
+    return [sum(b[j] * krawtchouk(n, w, j) for j in dual) // size for w in range(0, n + 1)]
+
+# Number of weight w patterns one bit away from a non zero codeword
+def miscorrect_weights(a):
+    n = len(a) - 1
+    m = [0] * (n + 1)
+    for w in range(2, n + 1):
+        m[w] = (w + 1) * (a[w + 1] if w < n else 0) + (n - w + 1) * a[w - 1]
+    return m
+
+# Probability that some pattern of the given per-weight counts happens,
+# for each bit error rate of ber
+def _probability(counts, ber):
+    p = np.asarray(ber, dtype=np.float64)
+    n = len(counts) - 1
+    return sum(float(c) * p ** w * (1 - p) ** (n - w) for w, c in enumerate(counts) if c)
+
+def p_undetected(a, ber):
+    return _probability([0] + a[1:], ber)
+
+def p_miscorrect(a, ber):
+    return _probability(miscorrect_weights(a), ber)
+
+# Probabilities of the outcomes of a codeword sent over a binary
+# symmetric channel, for each bit error rate of ber. Detected errors are
+# summed rather than taken as what remains, which would cancel out at
+# low error rates.
+def reliability(code, ber):
+    a = weight_distribution(code.pcm)
+    m = miscorrect_weights(a)
+    n = code.n
+    detected = [0, 0] + [comb(n, w) - a[w] - m[w] for w in range(2, n + 1)]
+    return {"clean": _probability([1] + [0] * n, ber),
+            "corrected": _probability([0, n] + [0] * (n - 1), ber),
+            "undetected": p_undetected(a, ber),
+            "miscorrected": p_miscorrect(a, ber),
+            "detected": _probability(detected, ber)}
+
+def print_weights(code, ber, weights=8):
+    a = weight_distribution(code.pcm)
+    first = ", ".join(f"A{w} = {a[w]}" for w in range(1, weights + 1))
+    print(f"{code.name}, table decoder: d = {min(w for w in range(1, code.n + 1) if a[w])}, {first}")
+    rel = {o: np.atleast_1d(v) for o, v in reliability(code, ber).items()}
+    print(f"    {'ber':>9} {'undetected':>12} {'miscorrected':>12} {'detected':>12}")
+    for i, p in enumerate(np.atleast_1d(ber)):
+        print(f"    {p:>9.3g} {rel['undetected'][i]:>12.4e} {rel['miscorrected'][i]:>12.4e} "
+              f"{rel['detected'][i]:>12.4e}")